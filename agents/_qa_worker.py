@@ -0,0 +1,46 @@
+"""
+_qa_worker.py
+─────────────────────────────────────────────────────────────────────────────
+Entry point leve dos workers do pool forkserver do QA.
+
+Vive num módulo separado de propósito: ao desserializar o callable, o
+worker importa o módulo que o define. Se fosse o qa.py, cada task pagaria
+o import do stack de agentes inteiro (langchain, langgraph, supervisor) —
+mais caro que o cold-start de `python -m pytest` que o pool existe para
+eliminar. Aqui só entra stdlib + a ferramenta pedida, e o módulo é
+pré-carregado no forkserver (_QA_PRELOAD) para os forks herdarem-no quente.
+─────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+
+
+def _inprocess_entry(kind: str, argv: list[str], cwd: str) -> tuple[str, str, int]:
+    """
+    Roda pytest/mypy in-process no worker forkado (interpretador quente).
+    Executa em outro processo, então chdir e estado de plugin não vazam.
+    """
+    os.chdir(cwd)
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            if kind == "pytest":
+                import pytest
+                code = int(pytest.main(argv))
+            elif kind == "mypy":
+                from mypy import api
+                mypy_out, mypy_err, code = api.run(argv)
+                out.write(mypy_out)
+                err.write(mypy_err)
+            else:
+                raise ValueError(f"kind desconhecido: {kind}")
+    except SystemExit as e:
+        code = int(e.code or 0)
+    except Exception as e:
+        return out.getvalue(), f"Erro: {type(e).__name__}: {e}", 1
+    return out.getvalue(), err.getvalue(), code
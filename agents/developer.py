@@ -21,6 +21,8 @@ Padrão ReAct: o agente raciocina → age → observa em loop até concluir.
 from __future__ import annotations
 
 import os
+import re
+import threading
 
 from llm_factory import make_llm
 from langchain_core.messages import SystemMessage
@@ -36,6 +38,25 @@ from tools.filesystem import DEVELOPER_TOOLS
 
 DEVELOPER_MODEL = os.environ.get("ITDEPT_DEVELOPER_MODEL", "claude-sonnet-4-5")
 
+# Serializador para content não-string: orjson (C-level) se disponível,
+# senão json da stdlib; str() como último recurso para objetos não-JSON
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            return str(obj)
+except ImportError:
+    import json as _json
+
+    def _dumps(obj) -> str:
+        try:
+            return _json.dumps(obj, ensure_ascii=False)
+        except TypeError:
+            return str(obj)
+
 # ─────────────────────────────────────────────────────────────────────────────
 # System Prompt
 # ─────────────────────────────────────────────────────────────────────────────
@@ -129,12 +150,17 @@ def _build_developer_agent():
 
 # Instância global (lazy init na primeira chamada)
 _agent_instance = None
+_agent_lock = threading.Lock()
 
 
 def _get_agent():
     global _agent_instance
+    # Double-checked locking: evita que dois nós em paralelo construam
+    # o agente (init de LLM + tool binding) em duplicidade
     if _agent_instance is None:
-        _agent_instance = _build_developer_agent()
+        with _agent_lock:
+            if _agent_instance is None:
+                _agent_instance = _build_developer_agent()
     return _agent_instance
 
 
@@ -153,20 +179,15 @@ def developer_node(state: AgentState) -> AgentState:
     repo_path   = state.get("repo_path", ".")
     task        = state.get("task", "")
 
-    # Monta o prompt com contexto completo para o agente
-    user_prompt = f"""\
-## TASK ORIGINAL
-{task}
-
-## SUA INSTRUÇÃO (do IT Manager)
-{instruction}
-
-## REPOSITÓRIO
-{repo_path}
-
-Execute a instrução acima. Comece explorando o repositório se necessário,
-implemente as mudanças, valide com git_diff e faça o commit ao final.
-"""
+    # Monta o prompt com contexto completo para o agente — join evita as
+    # strings intermediárias do f-string quando task/instruction são multi-KB
+    user_prompt = "".join([
+        "## TASK ORIGINAL\n", task,
+        "\n\n## SUA INSTRUÇÃO (do IT Manager)\n", instruction,
+        "\n\n## REPOSITÓRIO\n", repo_path,
+        "\n\nExecute a instrução acima. Comece explorando o repositório se necessário,\n"
+        "implemente as mudanças, valide com git_diff e faça o commit ao final.\n",
+    ])
 
     try:
         agent = _get_agent()
@@ -177,12 +198,17 @@ implemente as mudanças, valide com git_diff e faça o commit ao final.
         })
 
         # Extrai o texto final da resposta
-        final_message = result["messages"][-1]
-        output = (
-            final_message.content
-            if isinstance(final_message.content, str)
-            else str(final_message.content)
-        )
+        content = result["messages"][-1].content
+        if isinstance(content, str):
+            output = content
+        elif isinstance(content, list):
+            # Mensagens em blocos (Anthropic): junta só o texto, sem repr gigante
+            output = "".join(
+                b.get("text", "") if isinstance(b, dict) else str(b)
+                for b in content
+            )
+        else:
+            output = _dumps(content)
 
         # Determina status baseado em keywords no output
         status = _infer_status(output)
@@ -204,33 +230,52 @@ implemente as mudanças, valide com git_diff e faça o commit ao final.
         artifacts=artifacts,
     )
 
-    return {**state, **updates}
+    return updates
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Padrões compilados uma única vez no import — evita recompilar a cada chamada
+# re.ASCII acelera a classe [^`]; extensões mais comuns primeiro para o
+# branch da alternação resolver cedo no caso típico
+_FILES_RE = re.compile(
+    r'`([^`]+\.(?:py|json|md|yaml|yml|toml|txt|ts|js))`', re.ASCII
+)
+_COMMIT_RE = re.compile(r'(?:feat|fix|refactor|chore|test|docs)\([^)]+\):[^\n]+')
+
+# Alternações de keywords — uma única varredura C-level em vez de
+# .lower() + N buscas de substring em Python por chamada
+_ERROR_RE = re.compile(
+    r"(?i)erro|error|falha|failed|exception|traceback|não foi possível|could not"
+)
+_WARNING_RE = re.compile(
+    r"(?i)aviso|warning|atenção|cuidado|parcialmente|incompleto"
+)
+_ERRO_COUNT_RE = re.compile(r"(?i)erro")
+_CODE_CHANGED_RE = re.compile(r"(?i)write_file|patch_file|commit")
+
+
+def _count_up_to(pattern: re.Pattern, text: str, limit: int) -> int:
+    """Conta matches de `pattern` em `text`, parando assim que passar de `limit`."""
+    count = 0
+    for _ in pattern.finditer(text):
+        count += 1
+        if count > limit:
+            break
+    return count
+
+
 def _infer_status(output: str) -> str:
     """Infere o status da execução com base no conteúdo do output."""
-    output_lower = output.lower()
-
-    error_keywords = [
-        "erro", "error", "falha", "failed", "exception",
-        "traceback", "não foi possível", "could not",
-    ]
-    warning_keywords = [
-        "aviso", "warning", "atenção", "cuidado",
-        "parcialmente", "incompleto",
-    ]
-
-    if any(kw in output_lower for kw in error_keywords):
+    if _ERROR_RE.search(output):
         # Erros de ferramenta no meio do processo são normais (ReAct recupera)
         # Só marca como erro se aparecer no report final
-        if output_lower.count("erro") > 2 or "❌" in output:
+        if _count_up_to(_ERRO_COUNT_RE, output, 2) > 2 or "❌" in output:
             return "error"
 
-    if any(kw in output_lower for kw in warning_keywords):
+    if _WARNING_RE.search(output):
         return "warning"
 
     return "success"
@@ -241,24 +286,21 @@ def _extract_artifacts(output: str) -> dict:
     Extrai informações estruturadas do report do agente.
     Retorna um dict com artefatos identificados no texto.
     """
-    import re
     artifacts = {}
 
     # Arquivos modificados
-    files_pattern = re.findall(r'`([^`]+\.(?:py|js|ts|json|yaml|yml|toml|md|txt))`', output)
+    files_pattern = _FILES_RE.findall(output)
     if files_pattern:
-        artifacts["files_changed"] = list(set(files_pattern))
+        # dict.fromkeys dedupa em uma passada preservando a ordem do report
+        artifacts["files_changed"] = list(dict.fromkeys(files_pattern))
 
     # Mensagem de commit
-    commit_pattern = re.search(
-        r'(?:feat|fix|refactor|chore|test|docs)\([^)]+\):[^\n]+',
-        output,
-    )
+    commit_pattern = _COMMIT_RE.search(output)
     if commit_pattern:
         artifacts["commit_message"] = commit_pattern.group().strip()
 
     # Marca que código foi alterado (QA precisa rodar depois)
-    if any(kw in output.lower() for kw in ["write_file", "patch_file", "commit"]):
+    if _CODE_CHANGED_RE.search(output):
         artifacts["code_changed"] = True
 
     return artifacts
@@ -268,4 +310,9 @@ def _extract_artifacts(output: str) -> dict:
 # Exportações
 # ─────────────────────────────────────────────────────────────────────────────
 
-__all__ = ["developer_node"]
\ No newline at end of file
+__all__ = ["developer_node"]
+
+# Pré-aquecimento opcional (servidores long-lived): tira o custo de construção
+# do agente do caminho crítico da primeira requisição
+if os.environ.get("ITDEPT_PREWARM_AGENTS") == "1":
+    _get_agent()
\ No newline at end of file
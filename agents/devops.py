@@ -20,7 +20,15 @@ Ferramentas:
 from __future__ import annotations
 
 import os
+import re
+import selectors
+import shutil
+import socket
 import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -40,6 +48,29 @@ from tools.filesystem import DEVOPS_TOOLS
 DEVOPS_MODEL   = os.environ.get("ITDEPT_DEVOPS_MODEL", "claude-sonnet-4-5")
 DEVOPS_TIMEOUT = int(os.environ.get("ITDEPT_DEVOPS_TIMEOUT", "120"))
 
+# TTL do cache de check_environment — o ambiente raramente muda dentro de
+# um mesmo loop ReAct, então evita re-spawnar 8+ subprocessos por chamada
+ENV_CACHE_TTL = float(os.environ.get("ITDEPT_ENV_CACHE_TTL", "30"))
+
+# Serializador para content não-string: orjson (C-level) se disponível,
+# senão json da stdlib; str() como último recurso para objetos não-JSON
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            return str(obj)
+except ImportError:
+    import json as _json
+
+    def _dumps(obj) -> str:
+        try:
+            return _json.dumps(obj, ensure_ascii=False)
+        except TypeError:
+            return str(obj)
+
 try:
     from tools.filesystem import ALLOWED_BASE_PATH
 except ImportError:
@@ -125,6 +156,14 @@ Você tem templates mentais prontos para:
 # Shell Tools do DevOps
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Binários resolvidos uma vez no import — execve com caminho absoluto
+# evita a varredura do PATH a cada spawn
+_BIN: dict[str, str] = {
+    name: shutil.which(name) or name
+    for name in ("python", "git", "docker", "node", "npm", "make", "pip")
+}
+
+
 def _run_cmd(
     args: list[str],
     cwd: Optional[str] = None,
@@ -133,7 +172,11 @@ def _run_cmd(
 ) -> tuple[str, str, int]:
     """Executa um comando e retorna (stdout, stderr, returncode)."""
     workdir = cwd or str(ALLOWED_BASE_PATH)
-    env = {**os.environ, **(env_extra or {})}
+    if args and args[0] in _BIN:
+        args = [_BIN[args[0]]] + args[1:]
+    # env=None herda o ambiente direto do SO — evita copiar os.environ inteiro
+    # a cada spawn quando não há overrides (o caso comum)
+    env = {**os.environ, **env_extra} if env_extra else None
     try:
         result = subprocess.run(
             args,
@@ -154,6 +197,81 @@ def _run_cmd(
         return "", f"Erro inesperado: {e}", 1
 
 
+# Cache (timestamp, report) por repo_path — ver ENV_CACHE_TTL
+_ENV_CACHE: dict[str, tuple[float, str]] = {}
+
+# Até quando o daemon Docker é considerado saudável (monotonic) — evita
+# re-spawnar `docker info` a cada tool call dentro da mesma janela
+_DOCKER_OK_UNTIL: float = 0.0
+
+# Labels de porta pré-formatados no import — o loop do scan faz só um get()
+_PORT_SERVICES = {
+    3000: "React/Node", 5000: "Flask", 5432: "PostgreSQL",
+    6379: "Redis", 8000: "Django/Uvicorn", 8080: "HTTP alt",
+    8888: "Jupyter", 27017: "MongoDB",
+}
+_PORT_LABEL = {p: f"{p} ({svc})" for p, svc in _PORT_SERVICES.items()}
+
+
+def _run_cmd_capped(
+    args: list[str],
+    cwd: Optional[str] = None,
+    timeout: int = DEVOPS_TIMEOUT,
+    cap_bytes: int = 131072,
+) -> tuple[str, str, int]:
+    """
+    Como _run_cmd, mas lê os pipes em streaming com memória limitada.
+
+    Mantém os primeiros `cap_bytes` e os últimos ~`cap_bytes` de cada stream —
+    suficiente para tools que despejam megabytes (docker build, pip list),
+    dos quais o código downstream só usa o início e o fim.
+    """
+    workdir = cwd or str(ALLOWED_BASE_PATH)
+    if args and args[0] in _BIN:
+        args = [_BIN[args[0]]] + args[1:]
+
+    def _drain(stream) -> str:
+        head = bytearray()
+        tail: deque[bytes] = deque(maxlen=max(1, cap_bytes // 4096))
+        truncated = False
+        for chunk in iter(lambda: stream.read(4096), b""):
+            if len(head) < cap_bytes:
+                head += chunk
+            else:
+                truncated = True
+                tail.append(chunk)
+        data = bytes(head)
+        if truncated:
+            data += b"\n... (trecho intermediario omitido) ...\n" + b"".join(tail)
+        return data.decode("utf-8", errors="replace")
+
+    try:
+        proc = subprocess.Popen(
+            args, cwd=workdir,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError as e:
+        return "", f"Comando não encontrado: {e}", 127
+    except Exception as e:
+        return "", f"Erro inesperado: {e}", 1
+
+    killer = threading.Timer(timeout, proc.kill)
+    killer.start()
+    try:
+        # stderr drenado em thread própria para não deadlockar o pipe
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            err_future = executor.submit(_drain, proc.stderr)
+            stdout = _drain(proc.stdout)
+            stderr = err_future.result()
+        code = proc.wait()
+    finally:
+        killer.cancel()
+
+    if code < 0:  # morto pelo timer
+        return stdout, stderr + f"\nTimeout após {timeout}s.", 1
+    return stdout, stderr, code
+
+
 @tool
 def check_environment(repo_path: Optional[str] = None) -> str:
     """
@@ -167,10 +285,17 @@ def check_environment(repo_path: Optional[str] = None) -> str:
         Relatório completo do ambiente atual.
     """
     cwd = repo_path or str(ALLOWED_BASE_PATH)
+
+    # Cache com TTL por repositório
+    cached = _ENV_CACHE.get(cwd)
+    if cached and time.monotonic() - cached[0] < ENV_CACHE_TTL:
+        return cached[1]
+
     sections: list[str] = ["🔍 Auditoria do Ambiente\n" + "─" * 50]
 
-    # Python e pip
-    for cmd, label in [
+    # Python e pip — probes disparados em paralelo: subprocess libera o GIL
+    # durante fork/exec, então o wall-time fica limitado pelo probe mais lento
+    cmds = [
         (["python", "--version"],  "Python"),
         (["python", "-m", "pip", "--version"], "pip"),
         (["git", "--version"],     "Git"),
@@ -178,8 +303,21 @@ def check_environment(repo_path: Optional[str] = None) -> str:
         (["docker", "compose", "version"], "Docker Compose"),
         (["node", "--version"],    "Node.js"),
         (["npm", "--version"],     "npm"),
-    ]:
-        out, err, code = _run_cmd(cmd, cwd=cwd, timeout=5)
+    ]
+    with ThreadPoolExecutor(max_workers=len(cmds) + 1) as executor:
+        probe_futures = [
+            executor.submit(_run_cmd, cmd, cwd=cwd, timeout=5)
+            for cmd, _ in cmds
+        ]
+        # pip list não depende dos probes — roda junto
+        pip_list_future = executor.submit(
+            _run_cmd,
+            ["python", "-m", "pip", "list", "--format=columns"],
+            cwd=cwd, timeout=10,
+        )
+        probe_results = [f.result() for f in probe_futures]
+
+    for (_, label), (out, err, code) in zip(cmds, probe_results):
         value = out.strip() or err.strip()
         status = "✅" if code == 0 else "❌"
         sections.append(f"  {status} {label}: {value[:60] if value else 'não instalado'}")
@@ -192,9 +330,16 @@ def check_environment(repo_path: Optional[str] = None) -> str:
         "docker-compose.yaml", ".env", ".env.example",
         "Makefile", ".github/workflows",
     ]
+    # Um único scandir substitui um stat() por arquivo da lista
+    try:
+        root_entries = {entry.name for entry in os.scandir(cwd)}
+    except OSError:
+        root_entries = set()
     for f in config_files:
-        path = Path(cwd) / f
-        exists = path.exists()
+        if "/" in f:
+            exists = os.path.isdir(os.path.join(cwd, f))
+        else:
+            exists = f in root_entries
         sections.append(f"  {'✅' if exists else '  '} {f}")
 
     # Variáveis de ambiente relevantes (sem revelar valores)
@@ -205,16 +350,15 @@ def check_environment(repo_path: Optional[str] = None) -> str:
         present = var in os.environ
         sections.append(f"  {'✅' if present else '  '} {var}")
 
-    # Pacotes Python instalados (resumo)
-    out, _, code = _run_cmd(
-        ["python", "-m", "pip", "list", "--format=columns"],
-        cwd=cwd, timeout=10,
-    )
+    # Pacotes Python instalados (resumo) — resultado do future disparado acima
+    out, _, code = pip_list_future.result()
     if code == 0:
         lines = out.strip().splitlines()
         sections.append(f"\n📦 Pacotes instalados: {max(0, len(lines)-2)}")
 
-    return "\n".join(sections)
+    report = "\n".join(sections)
+    _ENV_CACHE[cwd] = (time.monotonic(), report)
+    return report
 
 
 @tool
@@ -266,7 +410,9 @@ def run_pip(
     else:
         return f"[ERRO] Ação desconhecida: '{action}'. Use: install, uninstall, list, freeze, check."
 
-    stdout, stderr, code = _run_cmd(args, cwd=cwd)
+    # list/freeze podem despejar centenas de linhas — leitura com cap de memória
+    runner = _run_cmd_capped if action in ("list", "freeze") else _run_cmd
+    stdout, stderr, code = runner(args, cwd=cwd)
     output = (stdout + stderr).strip()
 
     status = "✅" if code == 0 else "❌"
@@ -304,12 +450,24 @@ def check_dependencies(
     warnings: list[str] = []
     infos:    list[str] = []
 
+    # Dispara os dois subprocessos pip já no início — eles rodam em paralelo
+    # entre si e com o parsing dos arquivos abaixo (wall-clock = max, não soma)
+    executor = ThreadPoolExecutor(max_workers=2)
+    fut_outdated = executor.submit(
+        _run_cmd,
+        ["python", "-m", "pip", "list", "--outdated", "--format=columns"],
+        cwd=cwd, timeout=30,
+    )
+    fut_check = executor.submit(
+        _run_cmd, ["python", "-m", "pip", "check"], cwd=cwd, timeout=15,
+    )
+
     # Analisa requirements.txt
     req_file = root / "requirements.txt"
     if req_file.exists():
-        lines = req_file.read_text().splitlines()
-        pkgs  = [l.strip() for l in lines if l.strip() and not l.startswith("#")]
-        unpinned = [p for p in pkgs if "==" not in p and ">=" not in p and "~=" not in p]
+        matches  = _REQ_LINE_RE.findall(req_file.read_text())
+        pkgs     = [name for name, _ in matches if name]
+        unpinned = [name for name, op in matches if name and not op]
 
         infos.append(f"📄 requirements.txt: {len(pkgs)} pacotes")
         if unpinned:
@@ -331,10 +489,7 @@ def check_dependencies(
             warnings.append("⚠️  pytest não configurado em pyproject.toml")
 
     # Verifica pacotes desatualizados
-    out, _, code = _run_cmd(
-        ["python", "-m", "pip", "list", "--outdated", "--format=columns"],
-        cwd=cwd, timeout=30,
-    )
+    out, _, code = fut_outdated.result()
     if code == 0 and out.strip():
         lines = out.strip().splitlines()[2:]  # remove header
         if lines:
@@ -345,7 +500,8 @@ def check_dependencies(
             )
 
     # Verifica conflitos
-    out, _, code = _run_cmd(["python", "-m", "pip", "check"], cwd=cwd, timeout=15)
+    out, _, code = fut_check.result()
+    executor.shutdown(wait=False)
     if code != 0 and out.strip():
         issues.append(f"❌ Conflitos de dependência:\n{out.strip()[:400]}")
 
@@ -397,12 +553,16 @@ def run_docker(
             f"Disponíveis: {', '.join(cmd_map.keys())}"
         )
 
-    # Verifica se Docker está disponível
-    _, _, check_code = _run_cmd(["docker", "info"], cwd=cwd, timeout=5)
-    if check_code != 0:
-        return "[AVISO] Docker não está rodando ou não está instalado."
+    # Verifica se Docker está disponível (probe cacheado por 10s)
+    global _DOCKER_OK_UNTIL
+    if time.monotonic() >= _DOCKER_OK_UNTIL:
+        _, _, check_code = _run_cmd(["docker", "info"], cwd=cwd, timeout=5)
+        if check_code != 0:
+            return "[AVISO] Docker não está rodando ou não está instalado."
+        _DOCKER_OK_UNTIL = time.monotonic() + 10.0
 
-    stdout, stderr, code = _run_cmd(cmd_map[action], cwd=cwd, timeout=120)
+    # builds/logs podem gerar megabytes — leitura em streaming com cap
+    stdout, stderr, code = _run_cmd_capped(cmd_map[action], cwd=cwd, timeout=120)
     output = (stdout + stderr).strip()
 
     status = "✅" if code == 0 else "❌"
@@ -424,29 +584,56 @@ def scan_ports(
     Returns:
         Status de cada porta: em uso ou livre.
     """
-    import socket
-
     check_ports = ports or [3000, 5000, 5432, 6379, 8000, 8080, 8888, 27017]
     results: list[str] = ["🔌 Status das portas:"]
 
-    port_services = {
-        3000: "React/Node", 5000: "Flask", 5432: "PostgreSQL",
-        6379: "Redis", 8000: "Django/Uvicorn", 8080: "HTTP alt",
-        8888: "Jupyter", 27017: "MongoDB",
-    }
+    # Conecta em todas as portas de uma vez com sockets não-bloqueantes e
+    # espera num único selector — o scan inteiro custa o timeout de UMA porta
+    # (0.3s) em vez da soma de todas.
+    status_map: dict[int, str] = {}
+    sel = selectors.DefaultSelector()
+    pending: list[socket.socket] = []
 
-    for port in check_ports:
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(0.3)
-                in_use = s.connect_ex(("127.0.0.1", port)) == 0
+    try:
+        for port in check_ports:
+            try:
+                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                s.setblocking(False)
+                if s.connect_ex(("127.0.0.1", port)) == 0:
+                    status_map[port] = "in_use"
+                    s.close()
+                    continue
+                sel.register(s, selectors.EVENT_WRITE, port)
+                pending.append(s)
+            except Exception:
+                status_map[port] = "error"
+
+        deadline = time.monotonic() + 0.3
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in sel.select(timeout=remaining):
+                sock = key.fileobj
+                err  = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                status_map[key.data] = "in_use" if err == 0 else "free"
+                sel.unregister(sock)
+    finally:
+        for s in pending:
+            try:
+                s.close()
+            except OSError:
+                pass
+        sel.close()
 
-            service = port_services.get(port, "")
-            label   = f"{port} ({service})" if service else str(port)
-            status  = "🔴 EM USO" if in_use else "🟢 livre"
-            results.append(f"  {status}  {label}")
-        except Exception:
+    for port in check_ports:
+        state = status_map.get(port, "free")  # sem resposta até o deadline = livre
+        label = _PORT_LABEL.get(port, str(port))
+        if state == "error":
             results.append(f"  ❓ erro    {port}")
+        else:
+            status = "🔴 EM USO" if state == "in_use" else "🟢 livre"
+            results.append(f"  {status}  {label}")
 
     return "\n".join(results)
 
@@ -475,7 +662,7 @@ def run_make(
             "Use write_file para criar um com os targets padrão."
         )
 
-    stdout, stderr, code = _run_cmd(["make", target], cwd=cwd)
+    stdout, stderr, code = _run_cmd_capped(["make", target], cwd=cwd)
     output = (stdout + stderr).strip()
 
     status = "✅" if code == 0 else "❌"
@@ -507,16 +694,21 @@ ALL_DEVOPS_TOOLS = DEVOPS_SHELL_TOOLS + DEVOPS_GIT_TOOLS + DEVOPS_TOOLS
 # ─────────────────────────────────────────────────────────────────────────────
 
 _devops_agent_instance = None
+_devops_agent_lock = threading.Lock()
 
 def _get_devops_agent():
     global _devops_agent_instance
+    # Double-checked locking: evita que dois nós em paralelo construam
+    # o agente (init de LLM + tool binding) em duplicidade
     if _devops_agent_instance is None:
-        llm = make_llm("devops", temperature=0, max_tokens=4096)
-        _devops_agent_instance = create_react_agent(
-            model=llm,
-            tools=ALL_DEVOPS_TOOLS,
-            state_modifier=SystemMessage(content=DEVOPS_SYSTEM_PROMPT),
-        )
+        with _devops_agent_lock:
+            if _devops_agent_instance is None:
+                llm = make_llm("devops", temperature=0, max_tokens=4096)
+                _devops_agent_instance = create_react_agent(
+                    model=llm,
+                    tools=ALL_DEVOPS_TOOLS,
+                    state_modifier=SystemMessage(content=DEVOPS_SYSTEM_PROMPT),
+                )
     return _devops_agent_instance
 
 
@@ -535,20 +727,15 @@ def devops_node(state: AgentState) -> AgentState:
     repo_path   = state.get("repo_path", ".")
     task        = state.get("task", "")
 
-    user_prompt = f"""\
-## TASK ORIGINAL
-{task}
-
-## SUA INSTRUÇÃO (do IT Manager)
-{instruction}
-
-## REPOSITÓRIO
-{repo_path}
-
-Comece com check_environment para entender o estado atual do ambiente,
-depois execute a instrução. Sempre leia os arquivos de configuração
-existentes antes de criar ou modificar qualquer um.
-"""
+    # join evita as strings intermediárias do f-string para task/instruction grandes
+    user_prompt = "".join([
+        "## TASK ORIGINAL\n", task,
+        "\n\n## SUA INSTRUÇÃO (do IT Manager)\n", instruction,
+        "\n\n## REPOSITÓRIO\n", repo_path,
+        "\n\nComece com check_environment para entender o estado atual do ambiente,\n"
+        "depois execute a instrução. Sempre leia os arquivos de configuração\n"
+        "existentes antes de criar ou modificar qualquer um.\n",
+    ])
 
     try:
         agent  = _get_devops_agent()
@@ -556,12 +743,17 @@ existentes antes de criar ou modificar qualquer um.
             "messages": [{"role": "user", "content": user_prompt}]
         })
 
-        final_message = result["messages"][-1]
-        output = (
-            final_message.content
-            if isinstance(final_message.content, str)
-            else str(final_message.content)
-        )
+        content = result["messages"][-1].content
+        if isinstance(content, str):
+            output = content
+        elif isinstance(content, list):
+            # Mensagens em blocos (Anthropic): junta só o texto, sem repr gigante
+            output = "".join(
+                b.get("text", "") if isinstance(b, dict) else str(b)
+                for b in content
+            )
+        else:
+            output = _dumps(content)
 
         status    = _infer_devops_status(output)
         artifacts = _extract_devops_artifacts(output)
@@ -578,36 +770,53 @@ existentes antes de criar ou modificar qualquer um.
         status=status,
         artifacts=artifacts,
     )
-    return {**state, **updates}
+    return updates
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Padrões compilados uma única vez no import — evita recompilar a cada chamada
+# re.ASCII acelera a classe [^`]; extensões mais comuns em DevOps primeiro
+_CONFIG_RE = re.compile(
+    r'`([^`]+\.(?:toml|yaml|yml|txt|env|cfg|ini|json|Dockerfile|Makefile))`',
+    re.ASCII,
+)
+_PIP_RE = re.compile(r'pip install[^\n]+', re.IGNORECASE)
+
+# Linha de requirements.txt: captura o nome do pacote e o operador de versão
+# (se houver) numa única passada C-level sobre o buffer inteiro
+_REQ_LINE_RE = re.compile(
+    r"^[ \t]*(?!#)([A-Za-z0-9_.\-\[\]]+)[ \t]*(==|>=|~=|<=|<|>)?",
+    re.MULTILINE,
+)
+
+# Alternações de keywords — uma única varredura C-level em vez de
+# .lower() + N buscas de substring em Python por chamada
+_ERROR_RE = re.compile(r"(?i)erro|error|failed|❌|conflito")
+_WARNING_RE = re.compile(r"(?i)aviso|warning|⚠️|desatualizado|sem versão")
+
+
 def _infer_devops_status(output: str) -> str:
-    lower = output.lower()
-    if any(k in lower for k in ["erro", "error", "failed", "❌", "conflito"]):
+    if _ERROR_RE.search(output):
         return "error"
-    if any(k in lower for k in ["aviso", "warning", "⚠️", "desatualizado", "sem versão"]):
+    if _WARNING_RE.search(output):
         return "warning"
     return "success"
 
 
 def _extract_devops_artifacts(output: str) -> dict:
-    import re
     artifacts: dict = {}
 
     # Arquivos de config criados/modificados
-    config_files = re.findall(
-        r'`([^`]+\.(?:txt|toml|yaml|yml|env|cfg|ini|json|Dockerfile|Makefile))`',
-        output,
-    )
+    config_files = _CONFIG_RE.findall(output)
     if config_files:
-        artifacts["config_files_changed"] = list(set(config_files))
+        # dict.fromkeys dedupa em uma passada preservando a ordem do report
+        artifacts["config_files_changed"] = list(dict.fromkeys(config_files))
 
     # Pacotes instalados
-    packages = re.findall(r'pip install[^\n]+', output, re.IGNORECASE)
+    packages = _PIP_RE.findall(output)
     if packages:
         artifacts["packages_installed"] = packages
 
@@ -618,4 +827,9 @@ def _extract_devops_artifacts(output: str) -> dict:
 # Exportações
 # ─────────────────────────────────────────────────────────────────────────────
 
-__all__ = ["devops_node", "DEVOPS_SHELL_TOOLS", "ALL_DEVOPS_TOOLS"]
\ No newline at end of file
+__all__ = ["devops_node", "DEVOPS_SHELL_TOOLS", "ALL_DEVOPS_TOOLS"]
+
+# Pré-aquecimento opcional (servidores long-lived): tira o custo de construção
+# do agente do caminho crítico da primeira requisição
+if os.environ.get("ITDEPT_PREWARM_AGENTS") == "1":
+    _get_devops_agent()
\ No newline at end of file
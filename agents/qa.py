@@ -19,8 +19,22 @@ Ferramentas:
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import functools
+import hashlib
+import json
+import multiprocessing
 import os
+import re
+import selectors
+import shutil
 import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -32,6 +46,7 @@ from langgraph.prebuilt import create_react_agent
 from state import AgentState
 from supervisor import record_agent_output
 from tools.filesystem import QA_TOOLS
+from _qa_worker import _inprocess_entry
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Configuração
@@ -40,11 +55,49 @@ from tools.filesystem import QA_TOOLS
 QA_MODEL   = os.environ.get("ITDEPT_QA_MODEL", "claude-sonnet-4-5")
 QA_TIMEOUT = int(os.environ.get("ITDEPT_QA_TIMEOUT", "120"))
 
+# Cache content-addressed de resultados de QA: chave = hash do estado dos
+# .py do repo; valor = (output, status, artifacts). LRU com teto pequeno —
+# evita re-spawnar toda a suíte quando o supervisor volta ao QA sem que
+# nenhum arquivo tenha mudado.
+_QA_CACHE: OrderedDict[str, tuple[str, str, dict]] = OrderedDict()
+_QA_CACHE_MAX = 32
+
+# Padrões compilados uma única vez no import — rodam a cada round do
+# supervisor, então o re.compile implícito por chamada não é de graça
+_COV_RE       = re.compile(r'cobertura[:\s]+(\d+)%', re.IGNORECASE)
+_COV_ALT_RE   = re.compile(r'(\d+)%\s*(?:coverage|cobertura)', re.IGNORECASE)
+_PASSED_RE    = re.compile(r'(\d+) passed')
+_FAILED_RE    = re.compile(r'(\d+) failed')
+_LINT_ERR_RE  = re.compile(r'(\d+) erro', re.IGNORECASE)
+_TOTAL_COV_RE = re.compile(r'TOTAL.*?(\d+)%')
+
+# Parser JSON: orjson (C-level, 3–5x o stdlib nos payloads do ruff) se
+# disponível, senão json da stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Checker fundido opcional (pyrefly/ty): lint + tipos numa única passada
+_PYREFLY_PATH = shutil.which("pyrefly")
+
+# pylint in-process (opcional): dispensa o subprocesso e o scrape de texto
+try:
+    from pylint.lint import Run as _PylintRun
+    from pylint.reporters.json_reporter import JSONReporter as _PylintJSONReporter
+except ImportError:
+    _PylintRun = None
+    _PylintJSONReporter = None
+
 try:
     from tools.filesystem import ALLOWED_BASE_PATH
 except ImportError:
     ALLOWED_BASE_PATH = Path(os.environ.get("ITDEPT_BASE_PATH", str(Path.cwd()))).resolve()
 
+# Resolvido uma vez no import — evita um str(Path) novo a cada chamada de tool
+_ALLOWED_BASE_STR: str = str(ALLOWED_BASE_PATH)
+
 # ─────────────────────────────────────────────────────────────────────────────
 # System Prompt
 # ─────────────────────────────────────────────────────────────────────────────
@@ -55,8 +108,11 @@ Sua missão é garantir que o código é correto, limpo e bem coberto por testes
 
 ## SUAS FERRAMENTAS
 
+- run_quality_suite → pytest+cobertura, ruff e mypy numa tacada só (prefira esta)
 - run_pytest       → executa a suíte de testes
+- run_pytest_incremental → reroda só os testes que falharam na última rodada
 - run_coverage     → mede cobertura de código
+- run_fast_check   → lint + tipos numa única passada (ruff --preview/pyrefly)
 - run_linter       → ruff ou pylint para style/erros
 - run_type_check   → mypy para verificação de tipos
 - run_command      → comandos shell genéricos (use com cuidado)
@@ -80,8 +136,8 @@ Sua missão é garantir que o código é correto, limpo e bem coberto por testes
    - Foco em módulos que sofreram mudanças recentes
 
 4. **Rode linter e type check**
-   - run_linter nos arquivos modificados
-   - run_type_check para detectar erros de tipo
+   - run_fast_check nos arquivos modificados (lint + tipos numa passada)
+   - run_type_check(strict=True) apenas se run_fast_check apontar erros de tipo
 
 5. **Crie testes faltantes (se instruído)**
    - Use read_file para entender a função/classe a testar
@@ -130,24 +186,269 @@ ou avança para o Code Reviewer. Seja preciso e objetivo.
 # Shell Tools (específicas do QA)
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _scan(output: str) -> dict:
+    """
+    Uma única passada sobre o output: conta erros/avisos/notas (com os
+    predicados de cada ferramenta), captura a linha de resumo do pytest
+    e guarda head/tail para truncagem — substitui as 4–5 varreduras
+    separadas de splitlines + filter.
+    """
+    lint_errors = lint_warnings = mypy_errors = mypy_notes = total = 0
+    summary = ""
+
+    for line in output.splitlines():
+        total += 1
+        lower = line.lower()
+        if ": E" in line or "error" in lower:
+            lint_errors += 1
+        elif ": W" in line or "warning" in lower:
+            lint_warnings += 1
+        if ": error:" in line:
+            mypy_errors += 1
+        if ": note:" in line:
+            mypy_notes += 1
+        if "passed" in line or "failed" in line or "error" in line:
+            summary = line
+
+    return {
+        "lint_errors":   lint_errors,
+        "lint_warnings": lint_warnings,
+        "mypy_errors":   mypy_errors,
+        "mypy_notes":    mypy_notes,
+        "summary":       summary,
+        "total":         total,
+    }
+
+
+def _head_tail(s: str, head_lines: int = 40, tail_lines: int = 30) -> tuple[str, str, int]:
+    """
+    Head/tail de um output grande sem materializar a lista de linhas:
+    localiza o N-ésimo '\\n' para frente e o M-ésimo para trás com
+    find/rfind — varredura de O(head+tail) caracteres, enquanto um
+    splitlines() num log de 10 MB do pytest alocaria ~200k strings
+    só para descartá-las em seguida.
+    """
+    total = s.count("\n") + 1
+
+    pos = 0
+    for _ in range(head_lines):
+        nxt = s.find("\n", pos)
+        if nxt == -1:
+            pos = len(s)
+            break
+        pos = nxt + 1
+    head = s[:pos].rstrip("\n")
+
+    end = len(s)
+    for _ in range(tail_lines):
+        prev = s.rfind("\n", 0, end)
+        if prev == -1:
+            end = 0
+            break
+        end = prev
+    tail = s[end:].lstrip("\n")
+
+    return head, tail, total
+
+
+# Ambiente enxuto para os subprocessos de QA: menos varredura de
+# usersite/.pth e nenhum __pycache__ gravado pelos spawns repetidos.
+# PYTHONOPTIMIZE fica de fora de propósito — remover asserts quebraria
+# os próprios testes do pytest.
+_SLIM_ENV: dict[str, str] = {
+    k: v for k in ("PATH", "HOME", "LANG", "LC_ALL", "VIRTUAL_ENV",
+                   "TMPDIR", "PYTHONPATH")
+    if (v := os.environ.get(k)) is not None
+}
+_SLIM_ENV.update({
+    "PYTHONDONTWRITEBYTECODE": "1",
+    "PYTHONNOUSERSITE":        "1",
+    "PYTHONUNBUFFERED":        "1",
+    "PYTHONHASHSEED":          "0",
+    "NO_COLOR":                "1",
+})
+
+
+# Teto duro de output por subprocesso: um teste desgovernado que imprime
+# GBs mata o orquestrador por OOM antes do timeout chegar
+_MAX_OUTPUT_BYTES = int(os.environ.get("ITDEPT_MAX_OUTPUT", str(5 * 1024 * 1024)))
+
+
 def _run_shell(cmd: list[str], cwd: Optional[str] = None, timeout: int = QA_TIMEOUT) -> tuple[str, str, int]:
-    """Executa um comando shell e retorna (stdout, stderr, returncode)."""
-    workdir = cwd or str(ALLOWED_BASE_PATH)
+    """
+    Executa um comando shell e retorna (stdout, stderr, returncode).
+
+    Pipes de 64 KiB multiplexados via selectors (sem threads) e drenados
+    para SpooledTemporaryFile: output gigante de pytest -v não incha a
+    RSS (spill para disco após 1 MB) nem deadlocka o pipe. Passado o teto
+    de _MAX_OUTPUT_BYTES o filho é terminado e o output vem truncado.
+    """
+    workdir = cwd or _ALLOWED_BASE_STR
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
             cwd=workdir,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            encoding="utf-8",
-            errors="replace",
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=65536,
+            env=_SLIM_ENV,
         )
-        return result.stdout, result.stderr, result.returncode
     except FileNotFoundError as e:
         return "", f"Comando não encontrado: {e}", 127
+    except Exception as e:
+        return "", f"Erro: {e}", 1
+
+    out_buf = tempfile.SpooledTemporaryFile(max_size=1 << 20)
+    err_buf = tempfile.SpooledTemporaryFile(max_size=1 << 20)
+    deadline   = time.monotonic() + timeout
+    timed_out  = False
+    truncated  = False
+    bytes_read = 0
+
+    try:
+        sel = selectors.DefaultSelector()
+        sel.register(proc.stdout, selectors.EVENT_READ, out_buf)
+        sel.register(proc.stderr, selectors.EVENT_READ, err_buf)
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            for key, _ in sel.select(timeout=remaining):
+                chunk = key.fileobj.read1(65536)
+                if chunk:
+                    key.data.write(chunk)
+                    bytes_read += len(chunk)
+                else:
+                    sel.unregister(key.fileobj)
+            if bytes_read > _MAX_OUTPUT_BYTES:
+                truncated = True
+                break
+        sel.close()
+
+        if timed_out:
+            proc.kill()
+            proc.wait()
+            return "", f"Timeout após {timeout}s.", 1
+
+        if truncated:
+            # terminate educado primeiro; kill se o filho ignorar
+            proc.terminate()
+            try:
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+        code = proc.wait(timeout=max(deadline - time.monotonic(), 1))
     except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
         return "", f"Timeout após {timeout}s.", 1
+    except Exception as e:
+        proc.kill()
+        proc.wait()
+        return "", f"Erro: {e}", 1
+
+    def _drain(buf) -> str:
+        buf.seek(0)
+        data = buf.read()
+        buf.close()
+        return data.decode("utf-8", "replace")
+
+    stdout, stderr = _drain(out_buf), _drain(err_buf)
+    if truncated:
+        stderr += (
+            f"\n[TRUNCATED at {_MAX_OUTPUT_BYTES // (1024 * 1024)}MB] "
+            "processo terminado após exceder o teto de output "
+            "(ITDEPT_MAX_OUTPUT)."
+        )
+    return stdout, stderr, code
+
+
+# Pool forkserver: o servidor pré-importa as ferramentas uma vez; cada
+# execução forka um processo já quente (maxtasksperchild=1 garante estado
+# limpo de plugins entre runs) em vez de pagar o cold-start de
+# `python -m ...` + descoberta de plugins a cada chamada. O pool vive
+# pelo processo inteiro — o primeiro run paga o preload, todos os loops
+# Developer↔QA seguintes reaproveitam o interpretador quente.
+_qa_pool = None
+_qa_pool_lock = threading.Lock()
+
+# Módulos aquecidos no forkserver; ausentes são ignorados pelo preload.
+# _qa_worker entra na lista porque é o módulo que define o entry point —
+# sem ele aquecido, cada task pagaria seu import no worker recém-forkado
+_QA_PRELOAD = ["pytest", "mypy", "coverage", "pytest_cov", "xdist",
+               "_qa_worker"]
+
+
+def _get_qa_pool():
+    global _qa_pool
+    if _qa_pool is None:
+        with _qa_pool_lock:
+            if _qa_pool is None:
+                ctx = multiprocessing.get_context("forkserver")
+                ctx.set_forkserver_preload(_QA_PRELOAD)
+                _qa_pool = ctx.Pool(processes=1, maxtasksperchild=1)
+                atexit.register(_reset_qa_pool)
+    return _qa_pool
+
+
+def _reset_qa_pool() -> None:
+    global _qa_pool
+    with _qa_pool_lock:
+        if _qa_pool is not None:
+            _qa_pool.terminate()
+            _qa_pool = None
+
+
+def _run_tool(
+    kind: str, argv: list[str], cwd: Optional[str] = None,
+    timeout: int = QA_TIMEOUT,
+) -> tuple[str, str, int]:
+    """
+    Executa pytest/mypy via worker quente; se o pool não estiver
+    disponível (import falhou, plataforma sem forkserver), cai para o
+    subprocesso tradicional com comportamento idêntico.
+    """
+    workdir = cwd or _ALLOWED_BASE_STR
+    try:
+        pool = _get_qa_pool()
+        job = pool.apply_async(_inprocess_entry, (kind, argv, workdir))
+        return job.get(timeout)
+    except multiprocessing.TimeoutError:
+        _reset_qa_pool()  # worker pode estar preso — derruba e recria
+        return "", f"Timeout após {timeout}s.", 1
+    except Exception:
+        return _run_shell(["python", "-m", kind] + argv, cwd=workdir,
+                          timeout=timeout)
+
+
+async def _run_shell_async(
+    cmd: list[str], cwd: Optional[str] = None, timeout: int = QA_TIMEOUT
+) -> tuple[str, str, int]:
+    """Variante async de _run_shell — permite sobrepor os subprocessos."""
+    workdir = cwd or _ALLOWED_BASE_STR
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=workdir,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            out, err = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return "", f"Timeout após {timeout}s.", 1
+        return (
+            out.decode("utf-8", "replace"),
+            err.decode("utf-8", "replace"),
+            proc.returncode or 0,
+        )
+    except FileNotFoundError as e:
+        return "", f"Comando não encontrado: {e}", 127
     except Exception as e:
         return "", f"Erro: {e}", 1
 
@@ -173,9 +474,70 @@ def run_pytest(
     Returns:
         Output completo do pytest com resumo de passes/falhas.
     """
-    cwd = repo_path or str(ALLOWED_BASE_PATH)
+    return _run_pytest_impl(path, test_file, verbose, fail_fast, repo_path)
+
+
+@tool
+def run_pytest_incremental(
+    path: str = ".",
+    test_file: Optional[str] = None,
+    repo_path: Optional[str] = None,
+) -> str:
+    """
+    Reexecuta apenas os testes que falharam na última rodada (--lf),
+    preservando o cache do pytest entre rounds Developer↔QA. Se nenhum
+    teste falhou antes, roda a suíte completa. Use quando o Developer
+    acabou de corrigir falhas pontuais — colecta ordens de grandeza
+    menos testes que a suíte inteira.
+
+    Args:
+        path:      Diretório ou arquivo de testes.
+        test_file: Arquivo específico de testes.
+        repo_path: Diretório raiz do repositório.
 
-    target = test_file or path
+    Returns:
+        Output do pytest com resumo de passes/falhas.
+    """
+    return _run_pytest_impl(path, test_file, True, False, repo_path,
+                            incremental=True)
+
+
+def _run_pytest_impl(
+    path: str,
+    test_file: Optional[str],
+    verbose: bool,
+    fail_fast: bool,
+    repo_path: Optional[str],
+    incremental: bool = False,
+) -> str:
+    """Corpo compartilhado de run_pytest / run_pytest_incremental."""
+    cwd = repo_path or _ALLOWED_BASE_STR
+
+    args = _pytest_cmd(test_file or path, verbose, fail_fast,
+                       incremental=incremental)
+    stdout, stderr, code = _run_tool("pytest", args[3:], cwd=cwd)
+
+    # Plugin xdist ausente: re-executa uma vez em processo único
+    if "unrecognized arguments: -n" in stdout + stderr:
+        args = _pytest_cmd(test_file or path, verbose, fail_fast,
+                           xdist=False, incremental=incremental)
+        stdout, stderr, code = _run_tool("pytest", args[3:], cwd=cwd)
+        return _format_pytest(stdout, stderr, code) + (
+            "\n[AVISO] pytest-xdist não instalado (pip install pytest-xdist) "
+            "— testes rodaram em um único processo."
+        )
+
+    return _format_pytest(stdout, stderr, code)
+
+
+def _pytest_cmd(
+    target: str,
+    verbose: bool = True,
+    fail_fast: bool = False,
+    xdist: bool = True,
+    incremental: bool = False,
+) -> list[str]:
+    """Monta a linha de comando do pytest (compartilhada sync/async)."""
     args = ["python", "-m", "pytest", target]
 
     if verbose:
@@ -184,27 +546,54 @@ def run_pytest(
         args.append("-x")
 
     # Output colorido desabilitado para parsing
-    args += ["--tb=short", "--no-header", "-p", "no:cacheprovider"]
+    args += ["--tb=short", "--no-header"]
+
+    if incremental:
+        # Mantém o .pytest_cache e reroda só o que falhou por último;
+        # sem falhas anteriores, roda tudo
+        args += ["--lf", "--last-failed-no-failures=all"]
+    else:
+        args += ["-p", "no:cacheprovider"]
+
+    if xdist:
+        args += _xdist_args()
+
+    return args
+
+
+def _xdist_args() -> list[str]:
+    """Flags do pytest-xdist: espalha os testes por N workers; loadfile
+    mantém as fixtures de módulo no mesmo worker."""
+    args = ["-n", os.environ.get("ITDEPT_XDIST_WORKERS", "auto"),
+            "--dist=loadfile"]
+    maxprocs = os.environ.get("ITDEPT_XDIST_MAXPROCESSES")
+    if maxprocs:
+        args.append(f"--maxprocesses={maxprocs}")
+    return args
 
-    stdout, stderr, code = _run_shell(args, cwd=cwd)
 
+def _format_pytest(stdout: str, stderr: str, code: int) -> str:
+    """Formata o resultado do pytest em report compacto."""
     output = (stdout + stderr).strip()
 
     if not output:
         return "[AVISO] pytest não produziu output. Verifique se está instalado: pip install pytest"
 
-    # Extrai linha de resumo
-    lines = output.splitlines()
-    summary = next((l for l in reversed(lines) if "passed" in l or "failed" in l or "error" in l), "")
+    head, tail, total = _head_tail(output)
+
+    # A linha de resumo do pytest fica no fim do log — procura só no tail
+    summary = ""
+    for line in reversed(tail.splitlines()):
+        if "passed" in line or "failed" in line or "error" in line:
+            summary = line
+            break
 
     status = "✅" if code == 0 else "❌"
     header = f"{status} pytest — {summary}" if summary else f"{status} pytest (código: {code})"
 
     # Limita output longo
-    if len(lines) > 100:
-        head = "\n".join(lines[:40])
-        tail = "\n".join(lines[-30:])
-        output = f"{head}\n\n... [{len(lines)-70} linhas omitidas] ...\n\n{tail}"
+    if total > 100:
+        output = f"{head}\n\n... [{total-70} linhas omitidas] ...\n\n{tail}"
 
     return f"{header}\n{'─'*50}\n{output}"
 
@@ -228,33 +617,39 @@ def run_coverage(
     Returns:
         Relatório de cobertura com porcentagem por arquivo.
     """
-    cwd = repo_path or str(ALLOWED_BASE_PATH)
+    cwd = repo_path or _ALLOWED_BASE_STR
 
-    args = [
+    args = _coverage_cmd(source, test_path)
+    stdout, stderr, code = _run_tool("pytest", args[3:], cwd=cwd)
+    return _format_coverage(stdout, stderr, code, min_coverage)
+
+
+def _coverage_cmd(
+    source: str = ".",
+    test_path: str = ".",
+    test_paths: Optional[list[str]] = None,
+) -> list[str]:
+    """Monta a linha de comando do pytest-cov (compartilhada sync/async)."""
+    return [
         "python", "-m", "pytest",
         f"--cov={source}",
         "--cov-report=term-missing",
         "--cov-report=json:/tmp/coverage.json",
         "--no-header", "-q",
-        test_path,
+        *(test_paths or [test_path]),
     ]
 
-    stdout, stderr, code = _run_shell(args, cwd=cwd)
+
+def _format_coverage(stdout: str, stderr: str, code: int, min_coverage: int = 80) -> str:
+    """Formata o relatório de cobertura em report compacto."""
     output = (stdout + stderr).strip()
 
     if "No module named pytest_cov" in output or "no module named coverage" in output.lower():
         return "[AVISO] pytest-cov não instalado. Execute: pip install pytest-cov"
 
-    lines = output.splitlines()
-
-    # Extrai linha de total
-    total_line = next((l for l in lines if "TOTAL" in l), "")
-    cov_percent = 0
-    if total_line:
-        import re
-        match = re.search(r'(\d+)%', total_line)
-        if match:
-            cov_percent = int(match.group(1))
+    # Extrai o percentual da linha TOTAL numa única varredura
+    match = _TOTAL_COV_RE.search(output)
+    cov_percent = int(match.group(1)) if match else 0
 
     status = "✅" if cov_percent >= min_coverage else "⚠️"
     header = f"{status} Cobertura: {cov_percent}% (mínimo: {min_coverage}%)"
@@ -268,6 +663,7 @@ def run_linter(
     linter: str = "ruff",
     fix: bool = False,
     repo_path: Optional[str] = None,
+    paths: Optional[list[str]] = None,
 ) -> str:
     """
     Executa linter no código para detectar erros de estilo e problemas.
@@ -277,23 +673,95 @@ def run_linter(
         linter:    "ruff" (padrão, mais rápido) ou "pylint".
         fix:       Se True e linter=ruff, aplica correções automáticas.
         repo_path: Diretório raiz do repositório.
+        paths:     Lista de arquivos específicos — prefira esta quando souber
+                   quais arquivos mudaram; o linter analisa só eles em vez
+                   do repositório inteiro.
 
     Returns:
         Lista de problemas encontrados pelo linter.
     """
-    cwd = repo_path or str(ALLOWED_BASE_PATH)
+    cwd = repo_path or _ALLOWED_BASE_STR
+    label = ", ".join(paths) if paths else path
+
+    if linter == "pylint" and _PylintRun is not None:
+        return _run_pylint_inprocess(paths or [path], cwd)
+
+    args = _linter_cmd(path, linter, fix, paths=paths,
+                       cache_dir=_tool_cache_dir("ruff", cwd) if linter == "ruff" else None)
+    if args is None:
+        return f"[ERRO] Linter desconhecido: '{linter}'. Use 'ruff' ou 'pylint'."
 
+    stdout, stderr, code = _run_shell(args, cwd=cwd)
+    return _format_linter(stdout, stderr, code, label, linter)
+
+
+def _linter_cmd(
+    path: str = ".",
+    linter: str = "ruff",
+    fix: bool = False,
+    paths: Optional[list[str]] = None,
+    cache_dir: Optional[str] = None,
+) -> Optional[list[str]]:
+    """Monta a linha de comando do linter (compartilhada sync/async)."""
+    # ruff e pylint aceitam vários alvos posicionais — passar só os arquivos
+    # alterados reduz os bytes varridos de O(repo) para O(diff)
+    targets = paths or [path]
     if linter == "ruff":
-        args = ["python", "-m", "ruff", "check", path]
+        args = ["python", "-m", "ruff", "check", *targets]
         if fix:
             args.append("--fix")
-        args += ["--output-format=concise"]
-    elif linter == "pylint":
-        args = ["python", "-m", "pylint", path, "--output-format=text", "--score=yes"]
-    else:
-        return f"[ERRO] Linter desconhecido: '{linter}'. Use 'ruff' ou 'pylint'."
+        if cache_dir:
+            args += ["--cache-dir", cache_dir]
+        # JSON estruturado: um json.loads substitui as varreduras de
+        # substring linha a linha na contagem de erros/avisos
+        args += ["--output-format=json"]
+        return args
+    if linter == "pylint":
+        return ["python", "-m", "pylint", *targets, "--output-format=text", "--score=yes"]
+    return None
+
+
+def _run_pylint_inprocess(targets: list[str], cwd: str) -> str:
+    """
+    Roda pylint in-process com JSONReporter: as contagens vêm das
+    mensagens estruturadas, sem subprocesso e sem regex sobre o texto.
+    """
+    import io
 
-    stdout, stderr, code = _run_shell(args, cwd=cwd)
+    label = ", ".join(targets)
+    buf = io.StringIO()
+    reporter = _PylintJSONReporter(buf)
+    prev = os.getcwd()
+    try:
+        os.chdir(cwd)
+        _PylintRun(targets, reporter=reporter, exit=False)
+    except Exception as e:
+        return f"[ERRO] pylint falhou: {type(e).__name__}: {e}"
+    finally:
+        os.chdir(prev)
+
+    try:
+        messages = _json_loads(buf.getvalue() or "[]")
+    except ValueError:
+        messages = []
+
+    if not messages:
+        return f"✅ pylint: Nenhum problema encontrado em '{label}'"
+
+    error_count   = sum(1 for m in messages if m.get("type") in ("error", "fatal"))
+    warning_count = sum(1 for m in messages if m.get("type") == "warning")
+
+    status = "❌" if error_count > 0 else "⚠️" if warning_count > 0 else "✅"
+    header = f"{status} pylint: {error_count} erro(s), {warning_count} aviso(s)"
+    lines  = [
+        f"{m.get('path')}:{m.get('line')}: [{m.get('message-id')}] {m.get('message')}"
+        for m in messages[:100]
+    ]
+    return f"{header}\n{'─'*50}\n" + "\n".join(lines)
+
+
+def _format_linter(stdout: str, stderr: str, code: int, path: str, linter: str) -> str:
+    """Formata o resultado do linter em report compacto."""
     output = (stdout + stderr).strip()
 
     if "No module named ruff" in output or "No module named pylint" in output:
@@ -303,13 +771,40 @@ def run_linter(
     if not output:
         return f"✅ {linter}: Nenhum problema encontrado em '{path}'"
 
-    lines = output.splitlines()
-    error_count   = sum(1 for l in lines if ": E" in l or "error" in l.lower())
-    warning_count = sum(1 for l in lines if ": W" in l or "warning" in l.lower())
+    if linter == "ruff":
+        try:
+            issues = _json_loads(stdout or "[]")
+        except ValueError:
+            issues = None
+        if isinstance(issues, list):
+            if not issues:
+                return f"✅ ruff: Nenhum problema encontrado em '{path}'"
+            error_count = sum(
+                1 for i in issues
+                if str(i.get("code") or "").startswith(("E", "F"))
+            )
+            warning_count = len(issues) - error_count
+            status = "❌" if error_count > 0 else "⚠️"
+            header = f"{status} ruff: {error_count} erro(s), {warning_count} aviso(s)"
+            lines = [
+                f"{i.get('filename')}:{i.get('location', {}).get('row')}: "
+                f"{i.get('code')} {i.get('message')}"
+                for i in issues[:100]
+            ]
+            return f"{header}\n{'─'*50}\n" + "\n".join(lines)
+
+    # Fallback texto (pylint via subprocesso ou JSON inválido)
+    scan = _scan(output)
+    error_count   = scan["lint_errors"]
+    warning_count = scan["lint_warnings"]
 
     status = "❌" if error_count > 0 else "⚠️" if warning_count > 0 else "✅"
     header = f"{status} {linter}: {error_count} erro(s), {warning_count} aviso(s)"
 
+    if scan["total"] > 100:
+        head, tail, total = _head_tail(output)
+        output = f"{head}\n\n... [{total-70} linhas omitidas] ...\n\n{tail}"
+
     return f"{header}\n{'─'*50}\n{output}"
 
 
@@ -318,6 +813,7 @@ def run_type_check(
     path: str = ".",
     strict: bool = False,
     repo_path: Optional[str] = None,
+    paths: Optional[list[str]] = None,
 ) -> str:
     """
     Executa mypy para verificação estática de tipos.
@@ -326,19 +822,43 @@ def run_type_check(
         path:      Arquivo ou módulo para verificar.
         strict:    Se True, usa --strict mode (mais rigoroso).
         repo_path: Diretório raiz do repositório.
+        paths:     Lista de arquivos específicos — prefira esta quando souber
+                   quais arquivos mudaram; o mypy analisa só eles (e seus
+                   imports) em vez do repositório inteiro.
 
     Returns:
         Lista de erros de tipo encontrados pelo mypy.
     """
-    cwd = repo_path or str(ALLOWED_BASE_PATH)
+    cwd = repo_path or _ALLOWED_BASE_STR
+    label = ", ".join(paths) if paths else path
+
+    args = _typecheck_cmd(path, strict, paths=paths,
+                          cache_dir=_tool_cache_dir("mypy", cwd))
+    stdout, stderr, code = _run_tool("mypy", args[3:], cwd=cwd)
+    return _format_typecheck(stdout, stderr, code, label)
 
-    args = ["python", "-m", "mypy", path, "--no-error-summary"]
+
+def _typecheck_cmd(
+    path: str = ".",
+    strict: bool = False,
+    paths: Optional[list[str]] = None,
+    cache_dir: Optional[str] = None,
+) -> list[str]:
+    """Monta a linha de comando do mypy (compartilhada sync/async)."""
+    targets = paths or [path]
+    args = ["python", "-m", "mypy", *targets, "--no-error-summary"]
+    if cache_dir:
+        # Backend sqlite: mais rápido que os .json por módulo nos re-runs
+        args += ["--cache-dir", cache_dir, "--sqlite-cache"]
     if strict:
         args.append("--strict")
     else:
         args += ["--ignore-missing-imports", "--no-strict-optional"]
+    return args
 
-    stdout, stderr, code = _run_shell(args, cwd=cwd)
+
+def _format_typecheck(stdout: str, stderr: str, code: int, path: str) -> str:
+    """Formata o resultado do mypy em report compacto."""
     output = (stdout + stderr).strip()
 
     if "No module named mypy" in output:
@@ -347,14 +867,137 @@ def run_type_check(
     if "Success: no issues found" in output or code == 0:
         return f"✅ mypy: Nenhum erro de tipo encontrado em '{path}'"
 
-    lines = output.splitlines()
-    error_count = sum(1 for l in lines if ": error:" in l)
-    note_count  = sum(1 for l in lines if ": note:" in l)
+    scan = _scan(output)
+    error_count = scan["mypy_errors"]
+    note_count  = scan["mypy_notes"]
 
     header = f"❌ mypy: {error_count} erro(s) de tipo, {note_count} nota(s)"
+
+    if scan["total"] > 100:
+        head, tail, total = _head_tail(output)
+        output = f"{head}\n\n... [{total-70} linhas omitidas] ...\n\n{tail}"
+
     return f"{header}\n{'─'*50}\n{output}"
 
 
+@tool
+def run_fast_check(
+    path: str = ".",
+    repo_path: Optional[str] = None,
+    paths: Optional[list[str]] = None,
+) -> str:
+    """
+    Checagem rápida fundida: uma única passada de AST (ruff --preview com
+    --select=ALL, ou pyrefly quando instalado) cobre lint E os erros de
+    tipo mais comuns — substitui ruff+mypy no caminho quente. Reserve
+    run_type_check(strict=True) para aprofundar apenas quando esta tool
+    apontar erros de tipo.
+
+    Args:
+        path:      Arquivo ou diretório para analisar.
+        repo_path: Diretório raiz do repositório.
+        paths:     Lista de arquivos específicos (prefira quando souber o diff).
+
+    Returns:
+        Contagens unificadas de erros/avisos com as ocorrências.
+    """
+    cwd = repo_path or _ALLOWED_BASE_STR
+    targets = paths or [path]
+    label = ", ".join(targets)
+
+    if _PYREFLY_PATH:
+        stdout, stderr, code = _run_shell([_PYREFLY_PATH, "check", *targets], cwd=cwd)
+        output = (stdout + stderr).strip()
+        if not output:
+            return f"✅ pyrefly: Nenhum problema encontrado em '{label}'"
+        scan = _scan(output)
+        status = "❌" if code != 0 else "⚠️"
+        return (
+            f"{status} pyrefly: {scan['lint_errors']} erro(s), "
+            f"{scan['lint_warnings']} aviso(s)\n{'─'*50}\n{output}"
+        )
+
+    args = [
+        "python", "-m", "ruff", "check", "--preview", "--select=ALL", *targets,
+        "--cache-dir", _tool_cache_dir("ruff", cwd),
+        "--output-format=json",
+    ]
+    stdout, stderr, code = _run_shell(args, cwd=cwd)
+
+    if "No module named ruff" in stdout + stderr:
+        return "[AVISO] ruff não instalado. Execute: pip install ruff"
+
+    try:
+        issues = _json_loads(stdout or "[]")
+    except ValueError:
+        return _format_linter(stdout, stderr, code, label, "ruff")
+
+    if not issues:
+        return f"✅ ruff --preview: Nenhum problema encontrado em '{label}'"
+
+    error_count = sum(
+        1 for i in issues
+        if str(i.get("code") or "").startswith(("E", "F", "PLE", "TC"))
+    )
+    warning_count = len(issues) - error_count
+    status = "❌" if error_count > 0 else "⚠️"
+    header = (
+        f"{status} ruff --preview: {error_count} erro(s), "
+        f"{warning_count} aviso(s) em '{label}'"
+    )
+    lines = [
+        f"{i.get('filename')}:{i.get('location', {}).get('row')}: "
+        f"{i.get('code')} {i.get('message')}"
+        for i in issues[:100]
+    ]
+    return f"{header}\n{'─'*50}\n" + "\n".join(lines)
+
+
+@tool
+def run_quality_suite(
+    source: str = ".",
+    test_path: str = ".",
+    repo_path: Optional[str] = None,
+) -> str:
+    """
+    Executa a suíte de qualidade completa de forma fundida: um único
+    pytest com --cov cobre testes E cobertura numa execução só, enquanto
+    ruff e mypy rodam em paralelo. Prefira esta tool a chamar run_pytest,
+    run_coverage, run_linter e run_type_check separadamente — elimina
+    cold-starts redundantes de interpretador.
+
+    Args:
+        source:    Módulo/pacote para medir cobertura.
+        test_path: Onde estão os testes.
+        repo_path: Diretório raiz do repositório.
+
+    Returns:
+        Report fundido: testes+cobertura, linter e type check.
+    """
+    cwd = repo_path or _ALLOWED_BASE_STR
+
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        # ruff e mypy são esperas de subprocesso — sobrepõem com o pytest
+        fut_lint = ex.submit(_run_shell, _linter_cmd(), cwd)
+        fut_mypy = ex.submit(_run_shell, _typecheck_cmd(), cwd)
+
+        cov_args = _coverage_cmd(source, test_path) + _xdist_args()
+        stdout, stderr, code = _run_shell(cov_args, cwd=cwd)
+        if "unrecognized arguments: -n" in stdout + stderr:
+            stdout, stderr, code = _run_shell(
+                _coverage_cmd(source, test_path), cwd=cwd
+            )
+
+        lint_res = fut_lint.result()
+        mypy_res = fut_mypy.result()
+
+    return "\n\n".join([
+        _format_coverage(stdout, stderr, code),
+        _format_linter(*lint_res, ".", "ruff"),
+        _format_typecheck(*mypy_res, "."),
+    ])
+
+
 @tool
 def run_command(
     command: str,
@@ -375,7 +1018,7 @@ def run_command(
         Output do comando.
     """
     import shlex
-    cwd = repo_path or str(ALLOWED_BASE_PATH)
+    cwd = repo_path or _ALLOWED_BASE_STR
 
     # Bloqueio básico de segurança
     blocked = ["rm -rf", "sudo", "chmod 777", "> /dev/", "dd if=", "mkfs"]
@@ -397,29 +1040,158 @@ def run_command(
     return f"{status} [{code}] {command}\n{'─'*40}\n{output}"
 
 
+def _tool_cache_dir(tool: str, cwd: str) -> str:
+    """
+    Diretório de cache estável por (ferramenta, repo): sobrevive entre os
+    loops do supervisor mesmo quando o repo_path é efêmero, então mypy/ruff
+    reaproveitam a análise incremental em vez de partir do zero a cada round.
+    """
+    d = Path(tempfile.gettempdir()) / f"itdept_{tool}" / hashlib.md5(cwd.encode()).hexdigest()
+    d.mkdir(parents=True, exist_ok=True)
+    return str(d)
+
+
+def _matching_test_files(py_files: list[str], repo_path: str) -> list[str]:
+    """
+    Mapeia módulos alterados para seus arquivos de teste via convenção de
+    nomes (tests/test_<modulo>.py e variações). Só devolve caminhos que
+    existem de fato no repositório.
+    """
+    root = Path(repo_path)
+    found: list[str] = []
+    for f in py_files:
+        name = Path(f).name
+        if name.startswith("test_") or name.endswith("_test.py"):
+            candidates = [f]
+        else:
+            candidates = [
+                f"tests/test_{name}",
+                f"test/test_{name}",
+                str(Path(f).with_name(f"test_{name}")),
+            ]
+        for c in candidates:
+            if (root / c).is_file():
+                found.append(c)
+                break
+    return found
+
+
+def _repo_state_key(repo_path: str) -> Optional[str]:
+    """
+    Chave content-addressed do repo: hash de (caminho, mtime_ns, tamanho)
+    de cada .py. Qualquer mudança em um arquivo Python muda a chave, então
+    um hit garante que o resultado anterior ainda vale.
+    """
+    try:
+        h = hashlib.blake2b(digest_size=16)
+        for p in sorted(Path(repo_path).rglob("*.py")):
+            sp = str(p)
+            if "__pycache__" in sp or ".venv" in sp or "venv" in sp:
+                continue
+            st = p.stat()
+            h.update(f"{sp}|{st.st_mtime_ns}|{st.st_size}\n".encode())
+        return h.hexdigest()
+    except OSError:
+        return None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pré-pass de qualidade (assíncrono)
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def _quality_prepass(
+    repo_path: str,
+    incremental: bool = False,
+    py_targets: Optional[list[str]] = None,
+    test_targets: Optional[list[str]] = None,
+) -> list[str]:
+    """
+    Executa as checagens fundidas em paralelo: um único pytest com --cov
+    (testes + cobertura na mesma execução) ao lado de ruff e mypy — a
+    latência total cai para a do check mais lento em vez da soma.
+
+    Com incremental=True, o pytest reroda só os testes que falharam na
+    última rodada (--lf). py_targets/test_targets limitam ruff/mypy/pytest
+    aos arquivos alterados em vez de varrer o repositório inteiro.
+    """
+    extra = ["--lf", "--last-failed-no-failures=all"] if incremental else []
+    label = ", ".join(py_targets) if py_targets else "."
+
+    async def _cov_with_fallback() -> tuple[str, str, int]:
+        res = await _run_shell_async(
+            _coverage_cmd(test_paths=test_targets) + extra + _xdist_args(),
+            cwd=repo_path,
+        )
+        if "unrecognized arguments: -n" in res[0] + res[1]:
+            res = await _run_shell_async(
+                _coverage_cmd(test_paths=test_targets) + extra, cwd=repo_path
+            )
+        return res
+
+    results = await asyncio.gather(
+        _cov_with_fallback(),
+        _run_shell_async(
+            _linter_cmd(paths=py_targets,
+                        cache_dir=_tool_cache_dir("ruff", repo_path)),
+            cwd=repo_path,
+        ),
+        _run_shell_async(
+            _typecheck_cmd(paths=py_targets,
+                           cache_dir=_tool_cache_dir("mypy", repo_path)),
+            cwd=repo_path,
+        ),
+        return_exceptions=True,
+    )
+
+    formatters = (
+        lambda r: _format_coverage(*r),
+        lambda r: _format_linter(*r, label, "ruff"),
+        lambda r: _format_typecheck(*r, label),
+    )
+
+    reports: list[str] = []
+    for res, fmt in zip(results, formatters):
+        if isinstance(res, Exception):
+            reports.append(f"[ERRO] Checagem falhou: {type(res).__name__}: {res}")
+        else:
+            reports.append(fmt(res))
+    return reports
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Todas as tools do QA
 # ─────────────────────────────────────────────────────────────────────────────
 
-QA_SHELL_TOOLS = [run_pytest, run_coverage, run_linter, run_type_check, run_command]
+QA_SHELL_TOOLS = [run_quality_suite, run_pytest, run_pytest_incremental,
+                  run_coverage, run_fast_check, run_linter, run_type_check,
+                  run_command]
 ALL_QA_TOOLS   = QA_SHELL_TOOLS + QA_TOOLS  # QA_TOOLS = fs tools do filesystem.py
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Construção do agente
 # ─────────────────────────────────────────────────────────────────────────────
 
-_qa_agent_instance = None
-
+@functools.cache
 def _get_qa_agent():
-    global _qa_agent_instance
-    if _qa_agent_instance is None:
-        llm = make_llm("qa", temperature=0, max_tokens=4096)
-        _qa_agent_instance = create_react_agent(
-            model=llm,
-            tools=ALL_QA_TOOLS,
-            state_modifier=SystemMessage(content=QA_SYSTEM_PROMPT),
-        )
-    return _qa_agent_instance
+    # functools.cache serve de singleton thread-safe: duas threads nunca
+    # constroem o agente (LLM + tool binding) em duplicidade
+    llm = make_llm("qa", temperature=0, max_tokens=4096)
+
+    # cache_control (prompt caching da Anthropic): o preâmbulo de ~800
+    # tokens do system prompt é servido do cache nas chamadas seguintes
+    # dentro da janela de 5 min — zero tokens de input e menor latência
+    # de primeiro token a cada round do supervisor
+    system = SystemMessage(content=[{
+        "type": "text",
+        "text": QA_SYSTEM_PROMPT,
+        "cache_control": {"type": "ephemeral"},
+    }])
+
+    return create_react_agent(
+        model=llm,
+        tools=ALL_QA_TOOLS,
+        state_modifier=system,
+    )
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -439,11 +1211,82 @@ def qa_node(state: AgentState) -> AgentState:
 
     # Descobre arquivos que foram alterados (contexto para o agente)
     changed_files = state.get("artifacts", {}).get("files_changed", [])
+    py_files   = [f for f in changed_files if f.endswith(".py")]
+    test_files = _matching_test_files(py_files, repo_path)
+
     changed_ctx = ""
     if changed_files:
+        # Um único join sem f-string por arquivo; diffs enormes são
+        # cortados em 50 entradas para não inflar o prompt (custo direto
+        # em tokens de input a cada loop do supervisor)
+        listed = changed_files[:50]
+        omitted = len(changed_files) - len(listed)
         changed_ctx = (
-            "\n\n## Arquivos recém-modificados (priorize estes):\n"
-            + "\n".join(f"  - {f}" for f in changed_files)
+            "\n\n## Arquivos recém-modificados (priorize estes):\n  - "
+            + "\n  - ".join(listed)
+        )
+        if omitted > 0:
+            changed_ctx += f"\n  - ... (+{omitted} arquivos)"
+        if py_files:
+            # Instrui runs direcionados: bytes varridos caem de O(repo)
+            # para O(diff) quando as tools recebem só os arquivos do diff
+            changed_ctx += (
+                "\nPasse estes arquivos diretamente às tools em vez de "
+                "analisar o repositório inteiro, ex.: "
+                f"run_linter(paths={py_files!r}) e "
+                f"run_type_check(paths={py_files!r})."
+            )
+        if test_files:
+            changed_ctx += (
+                f"\nTestes correspondentes aos módulos alterados: {test_files!r} "
+                "— rode o pytest direcionado neles primeiro."
+            )
+
+    # Cache hit: nenhum .py mudou desde a última rodada e o Developer não
+    # reportou mudanças — devolve o resultado anterior em microssegundos
+    cache_key = _repo_state_key(repo_path)
+    if cache_key and not changed_files:
+        cached = _QA_CACHE.get(cache_key)
+        if cached is not None:
+            _QA_CACHE.move_to_end(cache_key)
+            output, status, artifacts = cached
+            updates = record_agent_output(
+                state=state,
+                agent_name="qa",
+                output=output,
+                status=status,
+                artifacts=artifacts,
+            )
+            return updates
+
+    # Pré-executa as quatro checagens em paralelo; o agente fica com a
+    # interpretação e com re-execuções pontuais quando precisar aprofundar
+    # Round curto (poucos arquivos alterados): reroda só os testes que
+    # falharam na última passada em vez da suíte inteira
+    incremental = bool(changed_files) and len(changed_files) <= 5
+
+    try:
+        prepass_reports = asyncio.run(
+            _quality_prepass(
+                repo_path,
+                incremental=incremental,
+                py_targets=py_files or None,
+                test_targets=test_files or None,
+            )
+        )
+    except RuntimeError:
+        # Já existe um event loop neste thread — deixa o agente rodar as tools
+        prepass_reports = []
+    except Exception:
+        prepass_reports = []
+
+    prepass_ctx = ""
+    if prepass_reports:
+        prepass_ctx = (
+            "\n\n## RESULTADOS JÁ COLETADOS (pré-executados em paralelo)\n"
+            "Use-os como base do report; re-execute uma ferramenta apenas\n"
+            "para aprofundar um problema específico.\n\n"
+            + "\n\n".join(prepass_reports)
         )
 
     user_prompt = f"""\
@@ -452,7 +1295,7 @@ def qa_node(state: AgentState) -> AgentState:
 
 ## SUA INSTRUÇÃO (do IT Manager)
 {instruction}
-{changed_ctx}
+{changed_ctx}{prepass_ctx}
 
 ## REPOSITÓRIO
 {repo_path}
@@ -483,6 +1326,13 @@ claramente no report para que o Developer possa corrigir.
         status    = _infer_qa_status(output)
         artifacts = _extract_qa_artifacts(output)
 
+        # Memoriza o resultado para a próxima passada sem mudanças
+        if cache_key:
+            _QA_CACHE[cache_key] = (output, status, artifacts)
+            _QA_CACHE.move_to_end(cache_key)
+            while len(_QA_CACHE) > _QA_CACHE_MAX:
+                _QA_CACHE.popitem(last=False)
+
     except Exception as e:
         output    = f"❌ Erro no QA Agent: {type(e).__name__}: {e}"
         status    = "error"
@@ -495,19 +1345,23 @@ claramente no report para que o Developer possa corrigir.
         status=status,
         artifacts=artifacts,
     )
-    return {**state, **updates}
+    return updates
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
+_CRITICAL_KEYS = ("failed", "error", " 0%", "syntax error", "import error")
+_WARNING_KEYS  = ("warning", "aviso", "abaixo", "faltando", "missing")
+
+
 def _infer_qa_status(output: str) -> str:
     """Infere o status da execução do QA a partir do report."""
     lower = output.lower()
 
-    critical = ["failed", "error", " 0%", "syntax error", "import error"]
-    warnings  = ["warning", "aviso", "abaixo", "faltando", "missing"]
+    critical = _CRITICAL_KEYS
+    warnings = _WARNING_KEYS
 
     if any(k in lower for k in critical):
         # Falhas em testes são críticas
@@ -524,22 +1378,19 @@ def _infer_qa_status(output: str) -> str:
 
 def _extract_qa_artifacts(output: str) -> dict:
     """Extrai métricas estruturadas do report do QA."""
-    import re
     artifacts = {}
 
     # Cobertura
-    cov_match = re.search(r'cobertura[:\s]+(\d+)%', output, re.IGNORECASE)
-    if not cov_match:
-        cov_match = re.search(r'(\d+)%\s*(?:coverage|cobertura)', output, re.IGNORECASE)
+    cov_match = _COV_RE.search(output) or _COV_ALT_RE.search(output)
     if cov_match:
         artifacts["coverage_percent"] = int(cov_match.group(1))
 
     # Resultado pytest
-    pytest_match = re.search(r'(\d+) passed', output)
+    pytest_match = _PASSED_RE.search(output)
     if pytest_match:
         artifacts["tests_passed"] = int(pytest_match.group(1))
 
-    failed_match = re.search(r'(\d+) failed', output)
+    failed_match = _FAILED_RE.search(output)
     if failed_match:
         artifacts["tests_failed"] = int(failed_match.group(1))
         artifacts["qa_approved"]  = False
@@ -547,7 +1398,7 @@ def _extract_qa_artifacts(output: str) -> dict:
         artifacts["qa_approved"] = True
 
     # Erros de linting
-    lint_match = re.search(r'(\d+) erro', output, re.IGNORECASE)
+    lint_match = _LINT_ERR_RE.search(output)
     if lint_match:
         artifacts["lint_errors"] = int(lint_match.group(1))
 
@@ -21,26 +21,40 @@ Ferramentas:
 from __future__ import annotations
 
 import ast
+import bisect
+import functools
+import mmap
 import os
 import re
+import subprocess
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from llm_factory import make_llm
-from langchain_core.messages import SystemMessage
+# langchain_core.tools é o único import pesado necessário no topo (as
+# @tools precisam dele na definição). O resto do stack LLM — llm_factory,
+# langgraph, supervisor — só é importado quando o agente é de fato
+# construído, o que corta centenas de ms do import do módulo e deixa as
+# tools de AST utilizáveis isoladamente
 from langchain_core.tools import tool
-from langgraph.prebuilt import create_react_agent
 
-from state import AgentState
-from supervisor import record_agent_output
 from tools.filesystem import REVIEWER_TOOLS
 
+if TYPE_CHECKING:
+    from state import AgentState
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Configuração
 # ─────────────────────────────────────────────────────────────────────────────
 
 REVIEWER_MODEL = os.environ.get("ITDEPT_REVIEWER_MODEL", "claude-sonnet-4-5")
 
+# Teto de tamanho para análise completa: acima disso (código gerado ou
+# vendorado, tipicamente) o parse/scan integral estoura a latência da
+# revisão — as tools pulam a AST ou analisam por amostragem
+_REVIEWER_MAX_BYTES = int(os.environ.get("ITDEPT_REVIEWER_MAX_BYTES", "200000"))
+
 try:
     from tools.filesystem import ALLOWED_BASE_PATH
 except ImportError:
@@ -60,6 +74,9 @@ manutenível e siga boas práticas de engenharia de software.
 - analyze_complexity  → mede complexidade ciclomática de funções
 - find_code_smells    → detecta anti-patterns comuns
 - check_security      → identifica vulnerabilidades de segurança
+- analyze_complexity_batch / find_code_smells_batch / check_security_batch
+  → mesmas análises para VÁRIOS arquivos de uma vez (rodam em paralelo;
+    prefira quando mais de um arquivo mudou)
 - read_file           → leia o código para análise detalhada
 - search_in_files     → busque padrões específicos no repositório
 - get_repo_tree       → entenda a estrutura do projeto
@@ -77,9 +94,9 @@ manutenível e siga boas práticas de engenharia de software.
    - Verifique o histórico com git_log se necessário
 
 2. **Análise estática**
-   - analyze_complexity nos arquivos modificados
-   - find_code_smells para anti-patterns
-   - check_security para vulnerabilidades
+   - analyze_complexity_batch nos arquivos modificados (ou analyze_complexity para um só)
+   - find_code_smells_batch para anti-patterns
+   - check_security_batch para vulnerabilidades
 
 3. **Revisão manual**
    - Lógica correta e edge cases tratados?
@@ -140,6 +157,355 @@ Seja direto, construtivo e específico. Aponte linha e arquivo sempre que possí
 # AST Analysis Tools
 # ─────────────────────────────────────────────────────────────────────────────
 
+# tree-sitter opcional: parse + queries estruturais inteiramente em C —
+# ordem de grandeza mais rápido que ast.walk com isinstance em Python.
+# Qualquer falha (lib ausente, API incompatível) zera o parser e o
+# find_code_smells segue no caminho ast.
+try:
+    from tree_sitter import Language as _TsLanguage, Parser as _TsParser
+    import tree_sitter_python as _tsp
+
+    _TS_LANG   = _TsLanguage(_tsp.language())
+    _TS_PARSER = _TsParser(_TS_LANG)
+
+    # Queries compiladas uma vez no import
+    _TS_FUNC_Q     = _TS_LANG.query("(function_definition) @func")
+    _TS_CLASS_Q    = _TS_LANG.query("(class_definition) @cls")
+    _TS_EXCEPT_Q   = _TS_LANG.query("(except_clause) @exc")
+    _TS_WILDCARD_Q = _TS_LANG.query(
+        "(import_from_statement (wildcard_import)) @wild"
+    )
+except Exception:
+    _TS_PARSER = None
+
+# bandit in-process (opcional): dispensa o spin-up de ~200 ms do
+# `python -m bandit` e o parse duplicado do arquivo a cada check
+try:
+    from bandit.core import config as _bandit_config
+    from bandit.core import manager as _bandit_manager
+
+    _BANDIT_CONF = _bandit_config.BanditConfig()
+except Exception:
+    _BANDIT_CONF = None
+
+# Hash de conteúdo: blake3 (C-level, multithread) se disponível, senão sha256
+try:
+    from blake3 import blake3 as _hash_fn
+except ImportError:
+    from hashlib import sha256 as _hash_fn
+
+# Cache content-addressed de relatórios: numa revisão multi-turno o mesmo
+# arquivo é re-analisado várias vezes sem ter mudado — um hit devolve o
+# report pronto e pula ast.parse + toda a passada de regex. Duas camadas:
+# (mtime_ns, size) barato via stat antes de hashear o conteúdo.
+_analysis_cache: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+_ANALYSIS_CACHE_MAX = 2000
+_stat_cache: dict[tuple[str, str], tuple[tuple[int, int], str]] = {}
+
+
+def _analysis_key(tool_name: str, filepath: Path) -> Optional[tuple[str, str, str]]:
+    """
+    Chave de cache (tool, caminho, hash-do-conteúdo). O hash só é
+    recalculado quando (mtime_ns, size) mudam; devolve None se o arquivo
+    não puder ser lido (aí a tool segue sem cache).
+    """
+    try:
+        st = filepath.stat()
+        sig = (st.st_mtime_ns, st.st_size)
+        stat_key = (tool_name, str(filepath))
+        entry = _stat_cache.get(stat_key)
+        if entry is not None and entry[0] == sig:
+            digest = entry[1]
+        else:
+            digest = _hash_fn(filepath.read_bytes()).hexdigest()
+            _stat_cache[stat_key] = (sig, digest)
+        return (tool_name, str(filepath), digest)
+    except OSError:
+        return None
+
+
+def _cache_get(key: Optional[tuple[str, str, str]]) -> Optional[str]:
+    if key is None:
+        return None
+    report = _analysis_cache.get(key)
+    if report is not None:
+        _analysis_cache.move_to_end(key)
+    return report
+
+
+def _cache_put(key: Optional[tuple[str, str, str]], report: str) -> str:
+    if key is not None:
+        _analysis_cache[key] = report
+        if len(_analysis_cache) > _ANALYSIS_CACHE_MAX:
+            _analysis_cache.popitem(last=False)
+    return report
+
+
+@dataclass
+class _ParsedFile:
+    """Fonte + linhas + AST de um arquivo, compartilhados entre as tools."""
+    source: str
+    lines:  list[str]
+    tree:   Optional[ast.AST]       # None quando a sintaxe é inválida
+    error:  Optional[str] = None    # mensagem do SyntaxError, se houver
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_file(path_str: str, mtime_ns: int, size: int) -> _ParsedFile:
+    """Leitura + parse memoizados por (caminho, mtime_ns, size): as três
+    tools de análise reusam a mesma árvore em vez de parsear 3x por arquivo."""
+    source = Path(path_str).read_text(encoding="utf-8", errors="replace")
+    try:
+        tree: Optional[ast.AST] = ast.parse(source, filename=path_str)
+        error = None
+    except SyntaxError as e:
+        tree, error = None, str(e)
+    return _ParsedFile(source=source, lines=source.splitlines(),
+                       tree=tree, error=error)
+
+
+def _load_parsed(filepath: Path) -> _ParsedFile:
+    """Resolve a assinatura do stat e delega ao cache de parse."""
+    st = filepath.stat()
+    return _parse_file(str(filepath), st.st_mtime_ns, st.st_size)
+
+# Padrões compilados uma única vez no import. Os smells textuais vivem
+# numa única alternação MULTILINE aplicada ao fonte inteiro: o engine
+# percorre um buffer longo em C, sem loop Python linha a linha
+_SMELL_TEXT_RE = re.compile(
+    r'(?P<print_stmt>^[ \t]*print\s*\()'
+    r'|(?i:(?P<todo>\b(?:TODO|FIXME|HACK|XXX)\b))'
+    r'|(?P<single_letter>^[ \t]*(?P<sl_var>[a-zA-Z])[ \t]*=[ \t]*(?!range))',
+    re.MULTILINE,
+)
+_FOR_RE = re.compile(r'\bfor\b')
+
+
+def _line_starts(source: str) -> list[int]:
+    """Offsets do início de cada linha — base para traduzir match.start()
+    em número de linha via busca binária."""
+    starts = [0]
+    pos = source.find("\n")
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = source.find("\n", pos + 1)
+    return starts
+
+
+def _line_starts_bytes(buf) -> list[int]:
+    """Versão em bytes de _line_starts — usada pelo scan via mmap."""
+    starts = [0]
+    pos = buf.find(b"\n")
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = buf.find(b"\n", pos + 1)
+    return starts
+
+# Padrões de segurança: (chave, regex, severity, nome, descrição).
+# Descrição None = usa o trecho da própria linha (segredos hardcoded).
+_SEC_SPECS = [
+    ("eval_call",   r'\beval\s*\(',       "🔴 CRÍTICO", "eval()",         "Execução de código arbitrário"),
+    ("exec_call",   r'\bexec\s*\(',       "🔴 CRÍTICO", "exec()",         "Execução de código arbitrário"),
+    ("pickle_load", r'pickle\.loads?\(',   "🔴 CRÍTICO", "pickle.load",    "Deserialização insegura — RCE"),
+    ("shell_true",  r'subprocess.*shell\s*=\s*True', "🔴 CRÍTICO", "shell=True", "Command injection via shell=True"),
+    ("os_system",   r'os\.system\s*\(',   "🔴 CRÍTICO", "os.system()",    "Command injection"),
+    ("yaml_load",   r'yaml\.load\s*\(',   "🟠 ALTO",    "yaml.load()",    "Use yaml.safe_load() em vez disso"),
+    ("md5",         r'hashlib\.md5\(',    "🟠 ALTO",    "MD5",            "Hash fraco — use SHA-256+"),
+    ("sha1",        r'hashlib\.sha1\(',   "🟠 ALTO",    "SHA-1",          "Hash fraco — use SHA-256+"),
+    ("random_mod",  r'random\.',          "🟠 ALTO",    "random module",  "Use secrets para dados criptográficos"),
+    ("assert_kw",   r'assert\s+',         "🟡 MÉDIO",   "assert",         "Assertions removidas com -O — não use para validação"),
+    ("debug_true",  r'DEBUG\s*=\s*True',  "🟡 MÉDIO",   "DEBUG=True",     "Debug ativado — não vá para produção assim"),
+    ("hosts_wild",  r'ALLOWED_HOSTS\s*=\s*\[.*\*', "🟡 MÉDIO", "ALLOWED_HOSTS=*", "Host wildcard em produção"),
+    ("ssl_off",     r'verify\s*=\s*False', "🟡 MÉDIO",  "SSL verify=False", "Verificação SSL desabilitada"),
+    ("password",    r'(?i:(?:password|passwd|pwd)\s*=\s*["\'][^"\']{4,}["\'])',  "🔴 CRÍTICO", "Senha hardcoded", None),
+    ("api_key",     r'(?i:(?:api_key|apikey|api_secret)\s*=\s*["\'][^"\']{8,}["\'])', "🔴 CRÍTICO", "API key hardcoded", None),
+    ("secret_key",  r'(?i:(?:secret_key|secret)\s*=\s*["\'][^"\']{8,}["\'])',    "🔴 CRÍTICO", "Secret key hardcoded", None),
+    ("token",       r'(?i:token\s*=\s*["\'][a-zA-Z0-9._-]{20,}["\'])',       "🔴 CRÍTICO", "Token hardcoded", None),
+    ("aws_cred",    r'(?i:(?:aws_access_key|aws_secret)\s*=\s*["\'][^"\']+["\'])', "🔴 CRÍTICO", "AWS credential hardcoded", None),
+]
+
+# Alternação única com grupos nomeados: o engine varre cada linha UMA vez
+# em vez de 18; o lastgroup do match despacha para a tabela de metadados
+_ALL_SEC_RE = re.compile("|".join(f"(?P<{key}>{pat})" for key, pat, *_ in _SEC_SPECS))
+_SEC_META   = {key: (sev, name, desc) for key, _, sev, name, desc in _SEC_SPECS}
+
+# Alternação FUNDIDA (smells textuais + segurança) compilada em bytes:
+# uma única passada sobre o arquivo mapeado em memória alimenta tanto
+# find_code_smells quanto check_security — os grupos nomeados são
+# disjuntos, então o lastgroup particiona os hits por categoria
+_FUSED_RE_BYTES = re.compile(
+    _SMELL_TEXT_RE.pattern.encode("ascii") + b"|"
+    + _ALL_SEC_RE.pattern.encode("ascii"),
+    re.MULTILINE,
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _fused_scan(path_str: str, mtime_ns: int, size: int) -> tuple[tuple, tuple]:
+    """
+    Varre o arquivo mapeado em memória UMA vez com a alternação fundida
+    e particiona os hits. Memoizada por assinatura de stat: quando o
+    agente roda find_code_smells e check_security em sequência no mesmo
+    arquivo (o prompt incentiva exatamente isso), o segundo sai do cache.
+
+    Retorna (smell_hits, sec_hits); cada hit é (kind, lineno, extra, linha).
+    Só as linhas que casam são decodificadas; comentários já são
+    filtrados dos hits de segurança aqui.
+    """
+    if size == 0:
+        return (), ()
+    smell_hits: list = []
+    sec_hits:   list = []
+    with open(path_str, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        line_starts = _line_starts_bytes(mm)
+        for m in _FUSED_RE_BYTES.finditer(mm):
+            kind  = m.lastgroup
+            i     = bisect.bisect_right(line_starts, m.start())
+            start = line_starts[i - 1]
+            end   = mm.find(b"\n", start)
+            raw   = mm[start: end if end != -1 else len(mm)]
+            if kind in _SEC_META:
+                stripped_b = raw.strip()
+                if stripped_b.startswith(b"#"):
+                    continue
+                sec_hits.append((kind, i, None,
+                                 stripped_b.decode("utf-8", "replace")))
+            else:
+                if kind in ("single_letter", "sl_var"):
+                    extra = m.group("sl_var").decode("utf-8", "replace")
+                elif kind == "todo":
+                    extra = m.group("todo").decode("utf-8", "replace")
+                else:
+                    extra = None
+                smell_hits.append((kind, i, extra,
+                                   raw.decode("utf-8", "replace")))
+    return tuple(smell_hits), tuple(sec_hits)
+
+class _AnalysisVisitor(ast.NodeVisitor):
+    """
+    Uma única passada pela AST coleta complexidade por função E os smells
+    estruturais. Substitui o padrão antigo de ast.walk aninhado (um walk
+    externo + um walk por função/classe), que era O(N·profundidade) —
+    aqui cada nó é visitado exatamente uma vez.
+    """
+
+    def __init__(self, collect_structural: bool = True) -> None:
+        self.functions: list[tuple[int, str, int]] = []   # (complexity, name, lineno)
+        self.smells: list[tuple[str, int, str, str]] = [] # (severity, lineno, smell, detail)
+        self._func_stack:  list[list] = []  # [node, complexity]
+        self._class_stack: list[list] = []  # [node, method_count]
+        self._structural = collect_structural
+        # Contexto onde literais numéricos são legítimos (defaults de
+        # parâmetro, range(), definição de constante) — suprime magic number
+        self._suppress = 0
+
+    def _bump(self) -> None:
+        # Funções aninhadas contam os branches internos na função
+        # externa também — mesma semântica do walk por função
+        for entry in self._func_stack:
+            entry[1] += 1
+
+    def _visit_branch(self, node: ast.AST) -> None:
+        self._bump()
+        self.generic_visit(node)
+
+    # Dispatch por nome de método (dict lookup do NodeVisitor) em vez de
+    # isinstance contra uma tupla em cada nó — a maioria dos nós (Name,
+    # Load, Constant...) nem passa por aqui
+    visit_If = visit_For = visit_While = _visit_branch
+    visit_With = visit_Assert = _visit_branch
+    visit_BoolOp = visit_IfExp = visit_comprehension = _visit_branch
+
+    def visit_FunctionDef(self, node) -> None:
+        if self._structural:
+            end_line = getattr(node, "end_lineno", node.lineno)
+            length   = end_line - node.lineno
+            if length > 50:
+                self.smells.append(("⚠️", node.lineno, "Função longa",
+                                    f"'{node.name}' tem {length} linhas (máx recomendado: 50)"))
+
+            n_args = len(node.args.args)
+            if n_args > 5:
+                self.smells.append(("⚠️", node.lineno, "Muitos parâmetros",
+                                    f"'{node.name}' tem {n_args} parâmetros (máx recomendado: 5)"))
+
+        for cls in self._class_stack:
+            cls[1] += 1
+
+        entry = [node, 1]
+        self._func_stack.append(entry)
+        # Defaults de parâmetro não são magic numbers
+        self._suppress += 1
+        self.visit(node.args)
+        self._suppress -= 1
+        for child in ast.iter_child_nodes(node):
+            if child is not node.args:
+                self.visit(child)
+        self._func_stack.pop()
+        self.functions.append((entry[1], node.name, node.lineno))
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        entry = [node, 0]
+        self._class_stack.append(entry)
+        self.generic_visit(node)
+        self._class_stack.pop()
+
+        if not self._structural:
+            return
+
+        end_line = getattr(node, "end_lineno", node.lineno)
+        if end_line - node.lineno > 300:
+            self.smells.append(("⚠️", node.lineno, "God Class",
+                                f"'{node.name}' tem {end_line - node.lineno} linhas"))
+        if entry[1] > 20:
+            self.smells.append(("⚠️", node.lineno, "God Class",
+                                f"'{node.name}' tem {entry[1]} métodos"))
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        self._bump()
+        if self._structural and node.type is None:
+            self.smells.append(("❌", node.lineno, "Bare except",
+                                "Captura todas as exceções sem especificar o tipo"))
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if self._structural and any(a.name == "*" for a in node.names):
+            self.smells.append(("⚠️", node.lineno, "Wildcard import",
+                                f"'from {node.module} import *' polui o namespace"))
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        # Argumentos de range() são índices/limites legítimos
+        if isinstance(node.func, ast.Name) and node.func.id == "range":
+            self._suppress += 1
+            self.generic_visit(node)
+            self._suppress -= 1
+        else:
+            self.generic_visit(node)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        # Definição de constante nomeada (nível módulo/classe, alvo UPPER)
+        # é justamente o destino recomendado — não re-flagar o literal
+        if not self._func_stack and all(
+            isinstance(t, ast.Name) and t.id.isupper() for t in node.targets
+        ):
+            self._suppress += 1
+            self.generic_visit(node)
+            self._suppress -= 1
+        else:
+            self.generic_visit(node)
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        # type() is int exclui bool (isinstance(True, int) é True)
+        if (self._suppress == 0 and type(node.value) is int
+                and node.value not in (0, 1, -1)):
+            self.smells.append(("ℹ️", node.lineno, "Magic number",
+                                f"Considere extrair {node.value} para uma constante nomeada"))
+
+
 @tool
 def analyze_complexity(
     path: str,
@@ -165,19 +531,28 @@ def analyze_complexity(
         return f"[ERRO] Arquivo não encontrado: '{path}'"
     if filepath.suffix != ".py":
         return f"[AVISO] analyze_complexity funciona apenas com arquivos .py"
+    if filepath.stat().st_size > _REVIEWER_MAX_BYTES:
+        return (f"[AVISO] Arquivo grande demais para análise AST "
+                f"('{path}', {filepath.stat().st_size} bytes > "
+                f"{_REVIEWER_MAX_BYTES}) — provavelmente gerado/vendorado; "
+                "análise pulada.")
 
-    try:
-        source = filepath.read_text(encoding="utf-8", errors="replace")
-        tree   = ast.parse(source, filename=str(filepath))
-    except SyntaxError as e:
-        return f"[ERRO] Sintaxe inválida em '{path}': {e}"
+    cache_key = _analysis_key(f"complexity:{max_complexity}", filepath)
+    cached    = _cache_get(cache_key)
+    if cached is not None:
+        return cached
 
-    results: list[tuple[int, str, int]] = []  # (complexity, name, lineno)
+    try:
+        parsed = _load_parsed(filepath)
+    except OSError as e:
+        return f"[ERRO] Não foi possível ler '{path}': {e}"
+    if parsed.tree is None:
+        return f"[ERRO] Sintaxe inválida em '{path}': {parsed.error}"
+    tree = parsed.tree
 
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            complexity = _calc_complexity(node)
-            results.append((complexity, node.name, node.lineno))
+    visitor = _AnalysisVisitor()
+    visitor.visit(tree)
+    results = visitor.functions
 
     if not results:
         return f"[INFO] Nenhuma função encontrada em '{path}'"
@@ -212,24 +587,72 @@ def analyze_complexity(
     lines.append(f"\nResumo: {len(results)} funções | máx: {max_c} | "
                  f"críticas: {len(critical)} | altas: {len(high)}")
 
-    return "\n".join(lines)
+    return _cache_put(cache_key, "\n".join(lines))
 
 
-def _calc_complexity(node: ast.AST) -> int:
-    """Calcula complexidade ciclomática de um nó AST (McCabe simplificado)."""
-    complexity = 1
-    branch_nodes = (
-        ast.If, ast.For, ast.While, ast.ExceptHandler,
-        ast.With, ast.Assert, ast.comprehension,
-        ast.BoolOp,  # and/or também ramificam
-    )
-    for child in ast.walk(node):
-        if isinstance(child, branch_nodes):
-            complexity += 1
-        # Ternários também aumentam complexidade
-        elif isinstance(child, ast.IfExp):
-            complexity += 1
-    return complexity
+def _ts_captures(query, node) -> list:
+    """Normaliza o retorno de Query.captures entre versões do binding."""
+    caps = query.captures(node)
+    if isinstance(caps, dict):  # tree-sitter >= 0.24
+        return [n for nodes in caps.values() for n in nodes]
+    return [n for n, _ in caps]
+
+
+def _ts_structural_smells(source: str) -> Optional[list[tuple[str, int, str, str]]]:
+    """
+    Smells estruturais via queries tree-sitter (parse e matching em C).
+    Devolve None quando o tree-sitter não está disponível ou falhar —
+    o chamador cai no caminho ast.
+    """
+    if _TS_PARSER is None:
+        return None
+    try:
+        root = _TS_PARSER.parse(source.encode()).root_node
+        smells: list[tuple[str, int, str, str]] = []
+
+        for node in _ts_captures(_TS_FUNC_Q, root):
+            lineno = node.start_point[0] + 1
+            length = node.end_point[0] - node.start_point[0]
+            name_node = node.child_by_field_name("name")
+            name = name_node.text.decode() if name_node is not None else "?"
+            if length > 50:
+                smells.append(("⚠️", lineno, "Função longa",
+                               f"'{name}' tem {length} linhas (máx recomendado: 50)"))
+            params = node.child_by_field_name("parameters")
+            if params is not None:
+                n_args = sum(1 for c in params.named_children if c.type != "comment")
+                if n_args > 5:
+                    smells.append(("⚠️", lineno, "Muitos parâmetros",
+                                   f"'{name}' tem {n_args} parâmetros (máx recomendado: 5)"))
+
+        for node in _ts_captures(_TS_CLASS_Q, root):
+            lineno = node.start_point[0] + 1
+            length = node.end_point[0] - node.start_point[0]
+            name_node = node.child_by_field_name("name")
+            name = name_node.text.decode() if name_node is not None else "?"
+            if length > 300:
+                smells.append(("⚠️", lineno, "God Class",
+                               f"'{name}' tem {length} linhas"))
+            methods = len(_ts_captures(_TS_FUNC_Q, node))
+            if methods > 20:
+                smells.append(("⚠️", lineno, "God Class",
+                               f"'{name}' tem {methods} métodos"))
+
+        for node in _ts_captures(_TS_EXCEPT_Q, root):
+            has_type = any(c.type not in ("block", "comment")
+                           for c in node.named_children)
+            if not has_type:
+                smells.append(("❌", node.start_point[0] + 1, "Bare except",
+                               "Captura todas as exceções sem especificar o tipo"))
+
+        for node in _ts_captures(_TS_WILDCARD_Q, root):
+            stmt = node.text.decode()
+            smells.append(("⚠️", node.start_point[0] + 1, "Wildcard import",
+                           f"'{stmt}' polui o namespace"))
+
+        return smells
+    except Exception:
+        return None
 
 
 @tool
@@ -256,87 +679,67 @@ def find_code_smells(
 
     if not filepath.exists():
         return f"[ERRO] Arquivo não encontrado: '{path}'"
+    if filepath.stat().st_size > _REVIEWER_MAX_BYTES:
+        return (f"[AVISO] Arquivo grande demais para análise AST "
+                f"('{path}', {filepath.stat().st_size} bytes > "
+                f"{_REVIEWER_MAX_BYTES}) — provavelmente gerado/vendorado; "
+                "análise pulada.")
 
-    try:
-        source = filepath.read_text(encoding="utf-8", errors="replace")
-        tree   = ast.parse(source, filename=str(filepath))
-        lines  = source.splitlines()
-    except SyntaxError as e:
-        return f"[ERRO] Sintaxe inválida: {e}"
-
-    smells: list[tuple[str, int, str, str]] = []  # (severity, lineno, smell, detail)
-
-    for node in ast.walk(tree):
+    cache_key = _analysis_key("smells", filepath)
+    cached    = _cache_get(cache_key)
+    if cached is not None:
+        return cached
 
-        # Funções muito longas (> 50 linhas)
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            end_line = getattr(node, "end_lineno", node.lineno)
-            length   = end_line - node.lineno
-            if length > 50:
-                smells.append(("⚠️", node.lineno, "Função longa",
-                               f"'{node.name}' tem {length} linhas (máx recomendado: 50)"))
-
-            # Muitos parâmetros (> 5)
-            n_args = len(node.args.args)
-            if n_args > 5:
-                smells.append(("⚠️", node.lineno, "Muitos parâmetros",
-                               f"'{node.name}' tem {n_args} parâmetros (máx recomendado: 5)"))
-
-        # Classes muito grandes (> 300 linhas ou > 20 métodos)
-        if isinstance(node, ast.ClassDef):
-            end_line = getattr(node, "end_lineno", node.lineno)
-            methods  = [n for n in ast.walk(node)
-                        if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
-            if end_line - node.lineno > 300:
-                smells.append(("⚠️", node.lineno, "God Class",
-                               f"'{node.name}' tem {end_line - node.lineno} linhas"))
-            if len(methods) > 20:
-                smells.append(("⚠️", node.lineno, "God Class",
-                               f"'{node.name}' tem {len(methods)} métodos"))
-
-        # Bare except
-        if isinstance(node, ast.ExceptHandler) and node.type is None:
-            smells.append(("❌", node.lineno, "Bare except",
-                           "Captura todas as exceções sem especificar o tipo"))
-
-        # Import wildcard
-        if isinstance(node, ast.ImportFrom) and any(
-            isinstance(a, ast.alias) and a.name == "*" for a in node.names
-        ):
-            smells.append(("⚠️", node.lineno, "Wildcard import",
-                           f"'from {node.module} import *' polui o namespace"))
-
-    # Análise de texto linha por linha
-    for i, line in enumerate(lines, 1):
+    try:
+        parsed = _load_parsed(filepath)
+    except OSError as e:
+        return f"[ERRO] Não foi possível ler '{path}': {e}"
+    if parsed.tree is None:
+        return f"[ERRO] Sintaxe inválida: {parsed.error}"
+    source, tree = parsed.source, parsed.tree
+
+    # Smells estruturais: tree-sitter (queries em C) quando disponível,
+    # senão uma única passada pela AST em Python. Magic numbers saem
+    # sempre do visitor (detecção por ast.Constant com contexto)
+    smells = _ts_structural_smells(source)
+    if smells is not None:
+        visitor = _AnalysisVisitor(collect_structural=False)
+        visitor.visit(tree)
+        smells += visitor.smells
+    else:
+        visitor = _AnalysisVisitor()
+        visitor.visit(tree)
+        smells = visitor.smells
+
+    # Análise textual: sai do scanner fundido (compartilhado com
+    # check_security) — uma passada pelo arquivo serve às duas tools
+    is_test = "test" in path.lower()
+    st = filepath.stat()
+    smell_hits, _ = _fused_scan(str(filepath), st.st_mtime_ns, st.st_size)
+
+    for kind, i, extra, line in smell_hits:
         stripped = line.strip()
 
         # print() em código (exceto em __main__ e tests)
-        if re.match(r'\bprint\s*\(', stripped) and "test" not in path.lower():
-            smells.append(("ℹ️", i, "print() statement",
-                           "Use logging ao invés de print() em produção"))
-
-        # Magic numbers
-        magic = re.findall(r'(?<!["\'\w])\b(?!0\b|1\b)(\d{2,})\b(?!["\'\w])', stripped)
-        if magic and not stripped.startswith("#"):
-            smells.append(("ℹ️", i, "Magic number",
-                           f"Considere extrair {magic[0]} para uma constante nomeada"))
+        if kind == "print_stmt":
+            if not is_test:
+                smells.append(("ℹ️", i, "print() statement",
+                               "Use logging ao invés de print() em produção"))
 
         # TODO / FIXME / HACK
-        if re.search(r'\b(TODO|FIXME|HACK|XXX)\b', stripped, re.IGNORECASE):
-            tag = re.search(r'\b(TODO|FIXME|HACK|XXX)\b', stripped, re.IGNORECASE).group()
-            smells.append(("ℹ️", i, f"{tag} pendente",
+        elif kind == "todo":
+            smells.append(("ℹ️", i, f"{extra} pendente",
                            stripped[:80]))
 
         # Variáveis de uma letra fora de loops
-        if re.match(r'^\s*([a-zA-Z])\s*=\s*(?!range)', line) and \
-           not re.search(r'\bfor\b', line):
-            var = re.match(r'^\s*([a-zA-Z])\s*=', line).group(1)
-            if var not in ("i", "j", "k", "x", "y", "z", "n", "_"):
+        elif kind in ("single_letter", "sl_var"):
+            if extra not in ("i", "j", "k", "x", "y", "z", "n", "_") and \
+               not _FOR_RE.search(line):
                 smells.append(("ℹ️", i, "Nome pouco descritivo",
-                               f"Variável '{var}' — use nomes mais descritivos"))
+                               f"Variável '{extra}' — use nomes mais descritivos"))
 
     if not smells:
-        return f"✅ Nenhum code smell detectado em '{path}'"
+        return _cache_put(cache_key, f"✅ Nenhum code smell detectado em '{path}'")
 
     smells.sort(key=lambda s: ({"❌": 0, "⚠️": 1, "ℹ️": 2}.get(s[0], 3), s[1]))
 
@@ -355,7 +758,7 @@ def find_code_smells(
     if len(smells) > 30:
         output_lines.append(f"\n  ... e mais {len(smells)-30} ocorrências")
 
-    return "\n".join(output_lines)
+    return _cache_put(cache_key, "\n".join(output_lines))
 
 
 @tool
@@ -382,73 +785,98 @@ def check_security(
     if not filepath.exists():
         return f"[ERRO] Arquivo não encontrado: '{path}'"
 
+    cache_key = _analysis_key("security", filepath)
+    cached    = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Arquivo grande: analisa só primeiros/últimos 100 KB — o scan é
+    # textual, então amostrar cabe aqui (diferente das tools de AST)
+    sampled = False
     try:
-        source = filepath.read_text(encoding="utf-8", errors="replace")
-        lines  = source.splitlines()
+        size = filepath.stat().st_size
+        if size > _REVIEWER_MAX_BYTES:
+            with open(filepath, "rb") as f:
+                head_bytes = f.read(100_000)
+                f.seek(max(size - 100_000, 100_000))
+                tail_bytes = f.read()
+            source = (head_bytes.decode("utf-8", "replace")
+                      + "\n# ... [trecho central omitido — arquivo grande] ...\n"
+                      + tail_bytes.decode("utf-8", "replace"))
+            lines = source.splitlines()
+            sampled = True
     except Exception as e:
         return f"[ERRO] Não foi possível ler '{path}': {e}"
 
     vulns: list[tuple[str, int, str, str]] = []  # (severity, lineno, vuln, detail)
 
-    # Padrões de vulnerabilidades
-    patterns = [
-        # (severity, regex, nome, descrição)
-        ("🔴 CRÍTICO", r'\beval\s*\(',       "eval()",         "Execução de código arbitrário"),
-        ("🔴 CRÍTICO", r'\bexec\s*\(',       "exec()",         "Execução de código arbitrário"),
-        ("🔴 CRÍTICO", r'pickle\.loads?\(',   "pickle.load",    "Deserialização insegura — RCE"),
-        ("🔴 CRÍTICO", r'subprocess.*shell\s*=\s*True', "shell=True", "Command injection via shell=True"),
-        ("🔴 CRÍTICO", r'os\.system\s*\(',   "os.system()",    "Command injection"),
-        ("🟠 ALTO",    r'yaml\.load\s*\(',   "yaml.load()",    "Use yaml.safe_load() em vez disso"),
-        ("🟠 ALTO",    r'hashlib\.md5\(',    "MD5",            "Hash fraco — use SHA-256+"),
-        ("🟠 ALTO",    r'hashlib\.sha1\(',   "SHA-1",          "Hash fraco — use SHA-256+"),
-        ("🟠 ALTO",    r'random\.',          "random module",  "Use secrets para dados criptográficos"),
-        ("🟡 MÉDIO",   r'assert\s+',         "assert",         "Assertions removidas com -O — não use para validação"),
-        ("🟡 MÉDIO",   r'DEBUG\s*=\s*True',  "DEBUG=True",     "Debug ativado — não vá para produção assim"),
-        ("🟡 MÉDIO",   r'ALLOWED_HOSTS\s*=\s*\[.*\*', "ALLOWED_HOSTS=*", "Host wildcard em produção"),
-        ("🟡 MÉDIO",   r'verify\s*=\s*False', "SSL verify=False", "Verificação SSL desabilitada"),
-    ]
-
-    # Padrões de segredos hardcoded
-    secret_patterns = [
-        (r'(?i)(password|passwd|pwd)\s*=\s*["\'][^"\']{4,}["\']',  "Senha hardcoded"),
-        (r'(?i)(api_key|apikey|api_secret)\s*=\s*["\'][^"\']{8,}["\']', "API key hardcoded"),
-        (r'(?i)(secret_key|secret)\s*=\s*["\'][^"\']{8,}["\']',    "Secret key hardcoded"),
-        (r'(?i)(token)\s*=\s*["\'][a-zA-Z0-9._-]{20,}["\']',       "Token hardcoded"),
-        (r'(?i)(aws_access_key|aws_secret)\s*=\s*["\'][^"\']+["\']', "AWS credential hardcoded"),
-    ]
-
-    for i, line in enumerate(lines, 1):
-        # Ignora comentários e docstrings simples
-        stripped = line.strip()
-        if stripped.startswith("#"):
-            continue
-
-        for severity, pattern, name, desc in patterns:
-            if re.search(pattern, line):
-                vulns.append((severity, i, name, desc))
-
-        for pattern, name in secret_patterns:
-            if re.search(pattern, line):
-                vulns.append(("🔴 CRÍTICO", i, name, line.strip()[:60]))
-
-    # Tenta usar bandit se disponível (mais completo)
-    try:
-        import subprocess
-        result = subprocess.run(
-            ["python", "-m", "bandit", "-r", str(filepath), "-f", "text", "-ll"],
-            capture_output=True, text=True, timeout=30,
-            cwd=str(ALLOWED_BASE_PATH),
-        )
-        if result.returncode == 0 and result.stdout:
-            bandit_section = f"\n\n📦 Análise bandit:\n{result.stdout[:800]}"
-        else:
-            bandit_section = ""
-    except Exception:
-        bandit_section = ""
+    # Uma passada de finditer; bisect traduz o offset do match em linha.
+    # Comentários são filtrados pós-match — casos raros, então custa
+    # menos que iterar linha a linha
+    if sampled:
+        line_starts = _line_starts(source)
+        for m in _ALL_SEC_RE.finditer(source):
+            i = bisect.bisect_right(line_starts, m.start())
+            stripped = lines[i - 1].strip()
+            if stripped.startswith("#"):
+                continue
+            severity, name, desc = _SEC_META[m.lastgroup]
+            vulns.append((severity, i, name,
+                          desc if desc is not None else stripped[:60]))
+    elif size > 0:
+        # Scanner fundido sobre o arquivo mapeado em memória (regex em
+        # bytes, sem decode completo) — compartilhado com
+        # find_code_smells, então rodar as duas tools custa UM scan
+        try:
+            st = filepath.stat()
+            _, sec_hits = _fused_scan(str(filepath), st.st_mtime_ns, st.st_size)
+        except Exception as e:
+            return f"[ERRO] Não foi possível ler '{path}': {e}"
+        for kind, i, _extra, stripped in sec_hits:
+            severity, name, desc = _SEC_META[kind]
+            vulns.append((severity, i, name,
+                          desc if desc is not None else stripped[:60]))
+
+    # Bandit (mais completo): in-process quando importável — os issues
+    # entram direto em vulns com o mesmo mapa de severidade; senão cai
+    # no subprocesso com a seção de texto truncada, como antes
+    bandit_section = ""
+    if sampled:
+        # Amostragem: bandit re-leria o arquivo inteiro — pula
+        pass
+    elif _BANDIT_CONF is not None:
+        try:
+            mgr = _bandit_manager.BanditManager(_BANDIT_CONF, "file")
+            mgr.discover_files([str(filepath)])
+            mgr.run_tests()
+            sev_map = {"HIGH": "🔴 CRÍTICO", "MEDIUM": "🟠 ALTO", "LOW": "🟡 MÉDIO"}
+            for issue in mgr.get_issue_list():
+                sev = sev_map.get(str(issue.severity).upper(), "🟡 MÉDIO")
+                vulns.append((sev, issue.lineno,
+                              f"bandit:{issue.test_id}", issue.text))
+        except Exception:
+            pass
+    else:
+        try:
+            result = subprocess.run(
+                ["python", "-m", "bandit", "-r", str(filepath), "-f", "text", "-ll"],
+                capture_output=True, text=True, timeout=30,
+                cwd=str(ALLOWED_BASE_PATH),
+            )
+            if result.returncode == 0 and result.stdout:
+                bandit_section = f"\n\n📦 Análise bandit:\n{result.stdout[:800]}"
+        except Exception:
+            pass
+
+    sample_note = ""
+    if sampled:
+        sample_note = ("\n[AVISO] Arquivo grande — análise por amostragem "
+                       "(primeiros/últimos 100 KB; linhas do trecho final "
+                       "são aproximadas).")
 
     if not vulns:
         base = f"✅ Nenhuma vulnerabilidade detectada em '{path}'"
-        return base + bandit_section
+        return _cache_put(cache_key, base + bandit_section + sample_note)
 
     vulns.sort(key=lambda v: ({"🔴 CRÍTICO": 0, "🟠 ALTO": 1, "🟡 MÉDIO": 2}.get(v[0], 3), v[1]))
 
@@ -463,14 +891,103 @@ def check_security(
         output_lines.append(f"  {severity}  linha {lineno:4d}  [{name}]")
         output_lines.append(f"             {detail}")
 
-    return "\n".join(output_lines) + bandit_section
+    return _cache_put(cache_key, "\n".join(output_lines) + bandit_section + sample_note)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Análise em lote (multi-arquivo)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _analysis_worker(job: tuple[str, str, Optional[str]]) -> str:
+    """Executa uma análise single-file num worker (picklável para o pool)."""
+    kind, path, repo_path = job
+    tool_fn = {
+        "complexity": analyze_complexity,
+        "smells":     find_code_smells,
+        "security":   check_security,
+    }[kind]
+    return tool_fn.func(path=path, repo_path=repo_path)
+
+
+def _run_batch(kind: str, paths: list[str], repo_path: Optional[str]) -> str:
+    """
+    Fan-out das análises por processo: ast.parse + regex são CPU-bound e
+    não liberam o GIL, então processos escalam quase linear com os cores.
+    Cai para execução sequencial se o pool não puder ser criado.
+    """
+    if not paths:
+        return "[AVISO] Nenhum arquivo informado."
+
+    jobs = [(kind, p, repo_path) for p in paths]
+
+    if len(jobs) > 1:
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+            workers = min(8, os.cpu_count() or 1, len(jobs))
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                return "\n\n".join(ex.map(_analysis_worker, jobs))
+        except Exception:
+            pass  # ambientes sem fork/semáforos: segue sequencial
+
+    return "\n\n".join(_analysis_worker(j) for j in jobs)
+
+
+@tool
+def analyze_complexity_batch(paths: list[str], repo_path: Optional[str] = None) -> str:
+    """
+    Versão em lote de analyze_complexity: analisa vários arquivos em
+    paralelo (um processo por core). Prefira esta quando mais de um
+    arquivo foi modificado.
+
+    Args:
+        paths:     Lista de arquivos Python para analisar.
+        repo_path: Diretório raiz do repositório.
+
+    Returns:
+        Relatórios de complexidade concatenados, um bloco por arquivo.
+    """
+    return _run_batch("complexity", paths, repo_path)
+
+
+@tool
+def find_code_smells_batch(paths: list[str], repo_path: Optional[str] = None) -> str:
+    """
+    Versão em lote de find_code_smells para vários arquivos de uma vez,
+    com fan-out por processo.
+
+    Args:
+        paths:     Lista de arquivos Python para analisar.
+        repo_path: Diretório raiz do repositório.
+
+    Returns:
+        Relatórios de smells concatenados, um bloco por arquivo.
+    """
+    return _run_batch("smells", paths, repo_path)
+
+
+@tool
+def check_security_batch(paths: list[str], repo_path: Optional[str] = None) -> str:
+    """
+    Versão em lote de check_security para vários arquivos de uma vez,
+    com fan-out por processo.
+
+    Args:
+        paths:     Lista de arquivos Python para analisar.
+        repo_path: Diretório raiz do repositório.
+
+    Returns:
+        Relatórios de segurança concatenados, um bloco por arquivo.
+    """
+    return _run_batch("security", paths, repo_path)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Tools do Reviewer
 # ─────────────────────────────────────────────────────────────────────────────
 
-REVIEWER_AST_TOOLS = [analyze_complexity, find_code_smells, check_security]
+REVIEWER_AST_TOOLS = [analyze_complexity, find_code_smells, check_security,
+                      analyze_complexity_batch, find_code_smells_batch,
+                      check_security_batch]
 
 try:
     from tools.git_tools import REVIEWER_GIT_TOOLS
@@ -488,6 +1005,10 @@ _reviewer_agent_instance = None
 def _get_reviewer_agent():
     global _reviewer_agent_instance
     if _reviewer_agent_instance is None:
+        from llm_factory import make_llm
+        from langchain_core.messages import SystemMessage
+        from langgraph.prebuilt import create_react_agent
+
         llm = make_llm("reviewer", temperature=0, max_tokens=4096)
         _reviewer_agent_instance = create_react_agent(
             model=llm,
@@ -501,6 +1022,34 @@ def _get_reviewer_agent():
 # Nó do grafo
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _git_head(repo_path: str) -> Optional[str]:
+    """SHA do HEAD atual, ou None fora de um repo git."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, timeout=10, cwd=repo_path,
+        )
+        if result.returncode == 0:
+            return result.stdout.strip() or None
+    except Exception:
+        pass
+    return None
+
+
+def _git_changed_since(sha: str, repo_path: str) -> list[str]:
+    """Arquivos alterados entre `sha` e HEAD (delta exato da revisão)."""
+    try:
+        result = subprocess.run(
+            ["git", "diff", "--name-only", f"{sha}..HEAD"],
+            capture_output=True, text=True, timeout=15, cwd=repo_path,
+        )
+        if result.returncode == 0:
+            return [ln for ln in result.stdout.splitlines() if ln]
+    except Exception:
+        pass
+    return []
+
+
 def reviewer_node(state: AgentState) -> AgentState:
     """
     Nó do Code Reviewer Agent no grafo LangGraph.
@@ -508,16 +1057,31 @@ def reviewer_node(state: AgentState) -> AgentState:
     Analisa o código modificado e emite um veredicto estruturado
     que o supervisor usa para decidir: aprovar, ajustar ou reprovar.
     """
+    from supervisor import record_agent_output
+
     instruction   = state.get("current_instruction", "")
     repo_path     = state.get("repo_path", ".")
     task          = state.get("task", "")
-    changed_files = state.get("artifacts", {}).get("files_changed", [])
+    artifacts_in  = state.get("artifacts", {})
+    changed_files = artifacts_in.get("files_changed", [])
+
+    # Revisão incremental: se já revisamos até um SHA, o delta exato
+    # (git diff) vale mais que a lista reportada pelo Developer — as
+    # tools rodam em O(delta) em vez de O(repo)
+    last_sha = artifacts_in.get("last_reviewed_sha")
+    head_sha = _git_head(repo_path)
+    if last_sha and last_sha != head_sha:
+        delta = _git_changed_since(last_sha, repo_path)
+        if delta:
+            changed_files = delta
 
     changed_ctx = ""
     if changed_files:
         changed_ctx = (
             "\n\n## Arquivos que foram modificados:\n"
             + "\n".join(f"  - {f}" for f in changed_files)
+            + "\n\nAnalise APENAS estes arquivos — o restante do repositório "
+            "não mudou desde a última revisão."
         )
 
     user_prompt = f"""\
@@ -556,6 +1120,9 @@ Emita o veredicto final usando o formato do report.
 
         status, verdict = _infer_review_verdict(output)
         artifacts = {"review_verdict": verdict, "review_done": True}
+        if head_sha:
+            # Próxima rodada revisa só o diff a partir daqui
+            artifacts["last_reviewed_sha"] = head_sha
 
     except Exception as e:
         output    = f"❌ Erro no Reviewer Agent: {type(e).__name__}: {e}"
@@ -569,13 +1136,23 @@ Emita o veredicto final usando o formato do report.
         status=status,
         artifacts=artifacts,
     )
-    return {**state, **updates}
+    return updates
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Ordem do mais severo ao menos severo: num report ambíguo (ex: cita
+# "aprovado" ao explicar por que reprovou), o primeiro marcador que casar
+# vence — então o veredicto mais grave tem prioridade
+_VERDICT_MARKERS = (
+    ("error",   "REPROVADO",       ("reprovado",)),
+    ("warning", "PRECISA_AJUSTES", ("precisa de ajustes", "⚠️ precisa")),
+    ("success", "APROVADO",        ("aprovado",)),
+)
+
+
 def _infer_review_verdict(output: str) -> tuple[str, str]:
     """
     Extrai o veredicto do report do reviewer.
@@ -583,14 +1160,11 @@ def _infer_review_verdict(output: str) -> tuple[str, str]:
     """
     lower = output.lower()
 
-    if "reprovado" in lower or "❌" in output and "reprovado" in lower:
-        return "error", "REPROVADO"
-
-    if "precisa de ajustes" in lower or "⚠️" in output and "ajustes" in lower:
-        return "warning", "PRECISA_AJUSTES"
-
-    if "aprovado" in lower or "✅" in output and "aprovado" in lower:
-        return "success", "APROVADO"
+    # Tabela precomputada em vez da cadeia de ifs antiga — menos scans
+    # por chamada e elimina o bug de precedência dos "or X and Y"
+    for status, verdict, markers in _VERDICT_MARKERS:
+        if any(m in lower for m in markers):
+            return status, verdict
 
     # Sem veredicto explícito — assume warning para ser conservador
     return "warning", "INCONCLUSIVO"
@@ -20,8 +20,10 @@ baseado no plano, no estado atual e nos outputs anteriores dos agentes.
 
 from __future__ import annotations
 
+import functools
 import json
 import os
+import re
 from datetime import datetime
 from typing import Literal
 
@@ -80,17 +82,25 @@ Para cada turno, você recebe o estado atual e deve responder com um JSON.
 O campo "next_agent" deve conter EXATAMENTE um dos valores abaixo — nada mais:
   "developer"  "qa"  "reviewer"  "devops"  "docs"  "FINISH"
 
-Exemplo de resposta válida:
+Exemplo de resposta válida (mantenha esta ordem de campos — "thinking"
+SEMPRE por último):
 ```json
 {
-  "thinking": "o developer criou o arquivo, preciso rodar QA agora",
   "next_agent": "qa",
   "instruction": "rode pytest e ruff no arquivo src/auth.py recém criado",
   "reason": "código novo sempre precisa passar pelo QA antes de finalizar",
-  "plan_update": null
+  "plan_update": null,
+  "thinking": "o developer criou o arquivo, preciso rodar QA agora"
 }
 ```
 
+Quando a sequência restante for determinística (ex: developer → qa →
+reviewer), emita-a inteira de uma vez com os campos opcionais:
+  "next_agents": ["developer", "qa", "reviewer"],
+  "instructions": ["implemente ...", "rode os testes ...", "revise ..."]
+A fila executa em ordem SEM nova consulta a você — você só volta a decidir
+quando ela acabar ou quando algum agente falhar.
+
 ## REGRAS DE ROTEAMENTO
 
 1. **Novo código** → developer → qa → reviewer → (docs se necessário) → FINISH
@@ -122,6 +132,18 @@ O campo "instruction" deve ser claro o suficiente para o agente executar
 sem precisar de contexto adicional — inclua nomes de arquivo, funções, etc.
 """
 
+# System prompt como bloco com cache_control: o supervisor roda a CADA
+# iteração com o mesmo prefixo estático, então as chamadas seguintes
+# dentro da janela de cache viram cache read (~10% do custo de input e
+# prefill bem mais rápido). Modelos sem suporte ignoram o campo.
+SUPERVISOR_SYSTEM_MESSAGE = SystemMessage(
+    content=[{
+        "type": "text",
+        "text": SUPERVISOR_SYSTEM_PROMPT,
+        "cache_control": {"type": "ephemeral"},
+    }]
+)
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Prompt de planejamento inicial
 # ─────────────────────────────────────────────────────────────────────────────
@@ -153,15 +175,30 @@ Responda SOMENTE com o JSON.
 # Prompt de roteamento (chamado a cada iteração)
 # ─────────────────────────────────────────────────────────────────────────────
 
-ROUTING_PROMPT = """\
-## ESTADO ATUAL
+# O prompt é dividido em prefixo estável + delta append-only: task, plano
+# e regras não mudam entre iterações, então ficam primeiro (com o segundo
+# breakpoint de cache no fim do bloco); o que varia por turno — outputs,
+# histórico, artefatos — é só anexado depois. Campos voláteis no topo
+# (como o timestamp que ficava aqui) invalidariam o prefixo inteiro
+
+ROUTING_STATIC_PROMPT = """\
+## CONTEXTO DO TASK
 
 Task original: {task}
 Plano: {plan}
-Iteração: {iteration}/{max_iterations}
-Timestamp: {timestamp}
+Limite de iterações: {max_iterations}
+
+Analise o estado abaixo e decida o próximo passo. Lembre-se:
+- Se houve mudança de código, QA deve rodar antes de FINISH
+- Se iteração >= {max_iterations}, force FINISH com nota sobre o limite
+
+Responda SOMENTE com o JSON de decisão.
+"""
 
-## OUTPUTS DOS AGENTES (mais recentes primeiro)
+ROUTING_DELTA_PROMPT = """\
+## ESTADO ATUAL — iteração {iteration}/{max_iterations}
+
+## OUTPUTS DOS AGENTES (ordem cronológica)
 
 {agent_outputs}
 
@@ -172,12 +209,6 @@ Timestamp: {timestamp}
 ## ARTEFATOS GERADOS
 
 {artifacts_summary}
-
-Analise o estado e decida o próximo passo. Lembre-se:
-- Se houve mudança de código, QA deve rodar antes de FINISH
-- Se iteração >= {max_iterations}, force FINISH com nota sobre o limite
-
-Responda SOMENTE com o JSON de decisão.
 """
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -186,51 +217,75 @@ Responda SOMENTE com o JSON de decisão.
 
 VALID_AGENTS = {"developer", "qa", "reviewer", "devops", "docs", "FINISH"}
 
+# Agentes roteáveis (sem FINISH) — congelado uma vez em vez de recriar o
+# set a cada chamada nos caminhos quentes de roteamento
+_ROUTABLE_AGENTS = frozenset(VALID_AGENTS - {"FINISH"})
 
-def _parse_json_response(raw: str) -> dict:
-    """
-    Extrai e parseia JSON da resposta do LLM.
-    Resiliente a: markdown code blocks, texto antes/depois, múltiplos blocos.
-    Após parsear, valida e sanitiza o campo next_agent.
-    """
-    import re
+_AGENT_ICONS = {
+    "developer": "👨‍💻", "qa": "🧪", "reviewer": "🔍",
+    "devops": "⚙️", "docs": "📚",
+}
 
-    clean = raw.strip()
+# orjson (C) quando instalado; json da stdlib como fallback
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-    # 1. Tenta extrair bloco ```json ... ```
-    m = re.search(r'```json\s*(.*?)\s*```', clean, re.DOTALL)
-    if m:
-        clean = m.group(1).strip()
-    else:
-        # 2. Tenta extrair bloco ``` ... ```
-        m = re.search(r'```\s*(.*?)\s*```', clean, re.DOTALL)
-        if m:
-            clean = m.group(1).strip()
-        else:
-            # 3. Tenta pegar o primeiro objeto JSON completo { ... }
-            m = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)?\}', clean, re.DOTALL)
-            if m:
-                clean = m.group(0).strip()
-
-    # Tenta parsear
-    data: dict | None = None
-    try:
-        data = json.loads(clean)
-    except json.JSONDecodeError:
-        # Último recurso: regex greedy para o maior bloco JSON
-        m = re.search(r'\{.*\}', clean, re.DOTALL)
-        if m:
-            try:
-                data = json.loads(m.group())
-            except json.JSONDecodeError:
-                pass
+# json5 aceita JSON "quase válido" (vírgulas sobrando, aspas simples) —
+# mas é ordens de magnitude mais lento, então só entra como último recurso
+try:
+    import json5 as _json5
+except ImportError:
+    _json5 = None
 
-    if data is None:
-        raise ValueError(f"Não foi possível parsear JSON da resposta:\n{raw[:500]}")
+# Compilado uma vez no import (antes: re.search com pattern literal a cada
+# chamada); cobre ```json ... ``` e ``` ... ``` num único pattern
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
 
-    # ── Sanitiza next_agent ────────────────────────────────────────────────
-    # O LLM às vezes retorna o exemplo literal do prompt ou valores inválidos
-    agent = str(data.get("next_agent", "")).strip().strip('"').strip("'")
+
+def _first_balanced_object(text: str) -> str | None:
+    """
+    Retorna o primeiro objeto JSON balanceado em `text`, ou None.
+    Uma única passada linear rastreando profundidade de chaves,
+    respeitando strings e escapes — substitui a cascata de regexes
+    DOTALL que varria a resposta inteira várias vezes.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    depth  = 0
+    in_str = False
+    esc    = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_str:
+            if esc:
+                esc = False
+            elif ch == "\\":
+                esc = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def _sanitize_agent(agent: str) -> str:
+    """
+    Normaliza o valor de next_agent vindo do LLM.
+    O LLM às vezes retorna o exemplo literal do prompt ou valores
+    inválidos; os valores se repetem entre turnos, daí o lru_cache.
+    """
+    agent = agent.strip().strip('"').strip("'")
 
     # Remove pipe e pega só o primeiro token (ex: "developer | qa" → "developer")
     if "|" in agent:
@@ -250,10 +305,97 @@ def _parse_json_response(raw: str) -> dict:
         matched = next((v for v in VALID_AGENTS if v in agent.lower()), None)
         agent = matched if matched else "FINISH"
 
-    data["next_agent"] = agent
+    return agent
+
+
+def _parse_json_response(raw: str) -> dict:
+    """
+    Extrai e parseia JSON da resposta do LLM.
+    Resiliente a: markdown code blocks, texto antes/depois, múltiplos blocos.
+    Após parsear, valida e sanitiza o campo next_agent.
+    """
+    clean = raw.strip()
+
+    m = _JSON_FENCE_RE.search(clean)
+    if m:
+        clean = m.group(1).strip()
+
+    candidate = _first_balanced_object(clean) or clean
+
+    data = None
+    try:
+        data = _json_loads(candidate)
+    except ValueError:
+        if _json5 is not None:
+            try:
+                data = _json5.loads(candidate)
+            except Exception:
+                pass
+
+    if not isinstance(data, dict):
+        raise ValueError(f"Não foi possível parsear JSON da resposta:\n{raw[:500]}")
+
+    data["next_agent"] = _sanitize_agent(str(data.get("next_agent", "")))
     return data
 
 
+# Os campos de decisão (next_agent, instruction, reason, plan_update) vêm
+# antes de "thinking" no formato exigido pelo prompt — assim que a chave
+# "thinking" aparece no stream, o resto da geração é decorativo e pode
+# ser descartado, cortando a latência do turno
+_THINKING_KEY_RE = re.compile(r',\s*"thinking"\s*:')
+
+
+def _chunk_text(chunk) -> str:
+    """Extrai o texto de um chunk de stream (str ou lista de blocos)."""
+    content = getattr(chunk, "content", "")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            b.get("text", "") if isinstance(b, dict) else str(b)
+            for b in content
+        )
+    return ""
+
+
+def _stream_until_decision(stream) -> str:
+    """
+    Consome o stream do LLM e para assim que "thinking" começa: fecha o
+    JSON truncado (os campos de decisão já estão completos) e abandona o
+    resto da geração. Se a chave nunca aparecer, retorna o texto inteiro.
+    """
+    text = ""
+    for chunk in stream:
+        text += _chunk_text(chunk)
+        m = _THINKING_KEY_RE.search(text)
+        if m:
+            return text[:m.start()] + "}"
+    return text
+
+
+async def _astream_until_decision(stream) -> str:
+    """Versão assíncrona de _stream_until_decision."""
+    text = ""
+    async for chunk in stream:
+        text += _chunk_text(chunk)
+        m = _THINKING_KEY_RE.search(text)
+        if m:
+            return text[:m.start()] + "}"
+    return text
+
+
+_STATUS_ICONS = {"success": "✅", "warning": "⚠️", "error": "❌"}
+
+
+def _entry_digest(entry: dict) -> str:
+    """Resumo de uma linha de um output de agente (status + primeira linha)."""
+    icon  = _STATUS_ICONS.get(entry.get("status", ""), "ℹ️")
+    first = entry.get("output", "").split("\n", 1)[0]
+    return (f"{icon} [{entry.get('agent', '?').upper()}] "
+            f"{entry.get('status', '')} — {first[:120]}")
+
+
 def _format_agent_outputs(state: AgentState) -> str:
     """Formata os outputs dos agentes para o prompt de roteamento."""
     outputs = state.get("agent_outputs", [])
@@ -261,13 +403,17 @@ def _format_agent_outputs(state: AgentState) -> str:
         return "  (nenhum output ainda)"
 
     lines = []
-    for entry in reversed(outputs[-6:]):  # últimos 6 outputs
-        agent = entry.get("agent", "?")
-        output = entry.get("output", "")
-        ts = entry.get("timestamp", "")
-        status = entry.get("status", "")
-        icon = "✅" if status == "success" else "⚠️" if status == "warning" else "❌"
-        lines.append(f"{icon} [{agent.upper()}] {ts}\n{output[:800]}\n")
+    # Ordem cronológica e em camadas: entradas antigas viram digest de
+    # uma linha (já calculado em record_agent_output e imutável dali em
+    # diante — o prefixo do prompt fica estável); só a mais recente vai
+    # na íntegra, pois é nela que a decisão de roteamento se baseia
+    for entry in outputs[-6:-1]:
+        lines.append(entry.get("_digest") or _entry_digest(entry))
+
+    last   = outputs[-1]
+    icon   = _STATUS_ICONS.get(last.get("status", ""), "ℹ️")
+    lines.append(f"\n{icon} [{last.get('agent', '?').upper()}] "
+                 f"{last.get('timestamp', '')}\n{last.get('output', '')[:2000]}\n")
 
     return "\n".join(lines)
 
@@ -294,13 +440,32 @@ def _format_routing_history(state: AgentState) -> str:
 def _get_repo_context(state: AgentState) -> str:
     """
     Gera um resumo rápido do repositório para o planejamento.
-    Usa get_repo_tree se disponível.
+    Usa get_repo_tree se disponível; o resultado é cacheado nos
+    artifacts (por _apply_planning_response), então replanejamentos e
+    outros nós reutilizam a árvore em vez de re-percorrer o disco.
     """
     repo_path = state.get("repo_path", ".")
+    cached = state.get("artifacts", {}).get("repo_tree_cache")
+    if cached and cached.get("repo_path") == repo_path:
+        return cached["tree"]
     try:
-        from tools.filesystem import get_repo_tree, list_directory
-        tree = get_repo_tree.invoke({"path": repo_path, "max_depth": 2})
-        return tree
+        from tools.filesystem import get_repo_tree
+        # .func pula o wrapper da tool (validação pydantic, callbacks) —
+        # a chamada tem forma fixa, o overhead do wrapper não compra nada
+        return get_repo_tree.func(path=repo_path, max_depth=2)
+    except Exception:
+        return f"Repositório em: {repo_path} (tree não disponível)"
+
+
+async def _aget_repo_context(state: AgentState) -> str:
+    """Versão assíncrona de _get_repo_context (mesmo cache)."""
+    repo_path = state.get("repo_path", ".")
+    cached = state.get("artifacts", {}).get("repo_tree_cache")
+    if cached and cached.get("repo_path") == repo_path:
+        return cached["tree"]
+    try:
+        from tools.filesystem import get_repo_tree
+        return await get_repo_tree.ainvoke({"path": repo_path, "max_depth": 2})
     except Exception:
         return f"Repositório em: {repo_path} (tree não disponível)"
 
@@ -309,102 +474,121 @@ def _get_repo_context(state: AgentState) -> str:
 # Nó principal: supervisor_node
 # ─────────────────────────────────────────────────────────────────────────────
 
-def supervisor_node(state: AgentState) -> AgentState:
+@functools.cache
+def _get_llm():
     """
-    Nó do Supervisor no grafo LangGraph.
-
-    Responsabilidades:
-    - Na primeira iteração: cria o plano de execução
-    - Nas demais: avalia outputs e decide o próximo agente
-    - Atualiza o estado com: next_agent, current_instruction, plan, routing_history
+    Cliente LLM do supervisor, construído uma única vez.
+    Reconstruir o ChatModel a cada iteração refazia sessão HTTP, auth e
+    afins; reutilizando a instância, a conexão (keepalive TLS) e o setup
+    são compartilhados entre todos os turnos.
     """
-    llm = make_llm("supervisor", temperature=0, max_tokens=1024)
+    return make_llm("supervisor", temperature=0, max_tokens=1024)
+
+def _build_planning_messages(state: AgentState, repo_context: str) -> list:
+    """Monta as mensagens da fase de planejamento."""
+    planning_prompt = PLANNING_PROMPT.format(
+        task=state.get("task", ""),
+        repo_path=state.get("repo_path", "."),
+        repo_context=repo_context,
+    )
+    return [SUPERVISOR_SYSTEM_MESSAGE, HumanMessage(content=planning_prompt)]
 
-    iteration  = state.get("iteration", 0)
-    plan       = state.get("plan", "")
-    task       = state.get("task", "")
 
-    # ── Fase 1: Planejamento inicial ─────────────────────────────────────────
-    if iteration == 0 or not plan:
-        repo_context = _get_repo_context(state)
+def _apply_planning_response(
+    state: AgentState,
+    raw: str,
+    repo_context: str = "",
+) -> AgentState:
+    """Parseia a resposta de planejamento e produz o estado atualizado."""
+    task = state.get("task", "")
+    try:
+        data = _parse_json_response(raw)
+    except ValueError as e:
+        # Se o LLM não retornar JSON válido, usa fallback seguro
+        data = {
+            "plan": f"Executar task: {task}",
+            "first_agent": "developer",
+            "first_instruction": task,
+            "complexity": "medium",
+            "thinking": str(e),
+            "estimated_steps": 3,
+        }
 
-        planning_prompt = PLANNING_PROMPT.format(
-            task=task,
-            repo_path=state.get("repo_path", "."),
-            repo_context=repo_context,
-        )
+    # Sanitiza first_agent com a mesma lógica do next_agent
+    first_agent = str(data.get("first_agent", "developer")).strip()
+    if "|" in first_agent:
+        first_agent = first_agent.split("|")[0].strip()
+    if first_agent.lower() == "finish":
+        first_agent = "developer"  # não faz sentido começar com FINISH
+    if first_agent not in _ROUTABLE_AGENTS:
+        first_agent = "developer"
+    data["first_agent"] = first_agent
 
-        response = llm.invoke([
-            SystemMessage(content=SUPERVISOR_SYSTEM_PROMPT),
-            HumanMessage(content=planning_prompt),
-        ])
-
-        try:
-            data = _parse_json_response(response.content)
-        except ValueError as e:
-            # Se o LLM não retornar JSON válido, usa fallback seguro
-            data = {
-                "plan": f"Executar task: {task}",
-                "first_agent": "developer",
-                "first_instruction": task,
-                "complexity": "medium",
-                "thinking": str(e),
-                "estimated_steps": 3,
-            }
-
-        # Sanitiza first_agent com a mesma lógica do next_agent
-        first_agent = str(data.get("first_agent", "developer")).strip()
-        if "|" in first_agent:
-            first_agent = first_agent.split("|")[0].strip()
-        if first_agent.lower() == "finish":
-            first_agent = "developer"  # não faz sentido começar com FINISH
-        if first_agent not in VALID_AGENTS - {"FINISH"}:
-            first_agent = "developer"
-        data["first_agent"] = first_agent
-
-        logger.debug("Planning response parsed: agent=%s complexity=%s",
-                     first_agent, data.get("complexity"))
-
-        new_message = AIMessage(
-            content=(
-                f"📋 **Plano criado** (complexidade: {data.get('complexity', '?')})\n\n"
-                f"{data.get('plan', '')}\n\n"
-                f"🚀 Começando com: **{data.get('first_agent', '?').upper()}**\n"
-                f"_{data.get('thinking', '')}_"
-            )
+    logger.debug("Planning response parsed: agent=%s complexity=%s",
+                 first_agent, data.get("complexity"))
+
+    new_message = AIMessage(
+        content=(
+            f"📋 **Plano criado** (complexidade: {data.get('complexity', '?')})\n\n"
+            f"{data.get('plan', '')}\n\n"
+            f"🚀 Começando com: **{data.get('first_agent', '?').upper()}**\n"
+            f"_{data.get('thinking', '')}_"
         )
+    )
 
-        return {
-            **state,
-            "plan":                data.get("plan", ""),
-            "next_agent":          data.get("first_agent", "developer"),
-            "current_instruction": data.get("first_instruction", task),
-            "iteration":           1,
-            "routing_history":     [],
-            "agent_outputs":       state.get("agent_outputs", []),
-            "artifacts":           state.get("artifacts", {}),
-            "messages":            state["messages"] + [new_message],
+    # Persiste a árvore do repo nos artifacts: replanejamentos (e outros
+    # nós) a reutilizam sem nova caminhada pelo filesystem
+    artifacts = {**state.get("artifacts", {})}
+    if repo_context:
+        artifacts["repo_tree_cache"] = {
+            "repo_path": state.get("repo_path", "."),
+            "tree":      repo_context,
         }
 
-    # ── Fase 2: Roteamento iterativo ─────────────────────────────────────────
-    routing_prompt = ROUTING_PROMPT.format(
-        task=task,
-        plan=plan,
-        iteration=iteration,
+    # Só as chaves atualizadas: as listas com reducer (messages etc.)
+    # recebem apenas o delta e o LangGraph acumula — espalhar **state
+    # de volta duplicaria as entradas além de copiar o estado inteiro
+    return {
+        "plan":                data.get("plan", ""),
+        "next_agent":          data.get("first_agent", "developer"),
+        "current_instruction": data.get("first_instruction", task),
+        "iteration":           1,
+        "artifacts":           artifacts,
+        "messages":            [new_message],
+    }
+
+
+def _build_routing_messages(state: AgentState) -> list:
+    """Monta as mensagens da fase de roteamento (prefixo estável + delta)."""
+    static_part = ROUTING_STATIC_PROMPT.format(
+        task=state.get("task", ""),
+        plan=state.get("plan", ""),
+        max_iterations=MAX_ITERATIONS,
+    )
+    delta_part = ROUTING_DELTA_PROMPT.format(
+        iteration=state.get("iteration", 0),
         max_iterations=MAX_ITERATIONS,
-        timestamp=datetime.now().strftime("%H:%M:%S"),
         agent_outputs=_format_agent_outputs(state),
         routing_history=_format_routing_history(state),
         artifacts_summary=_format_artifacts(state),
     )
+    return [
+        SUPERVISOR_SYSTEM_MESSAGE,
+        HumanMessage(content=[
+            {"type": "text", "text": static_part,
+             "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": delta_part},
+        ]),
+    ]
 
-    response = llm.invoke([
-        SystemMessage(content=SUPERVISOR_SYSTEM_PROMPT),
-        HumanMessage(content=routing_prompt),
-    ])
+
+def _apply_routing_response(state: AgentState, raw: str) -> AgentState:
+    """Parseia a decisão de roteamento e produz o estado atualizado."""
+    iteration = state.get("iteration", 0)
+    plan      = state.get("plan", "")
 
     try:
-        data = _parse_json_response(response.content)
+        data = _parse_json_response(raw)
     except ValueError:
         # Fallback: se não conseguiu parsear, encerra com aviso
         data = {
@@ -421,13 +605,38 @@ def supervisor_node(state: AgentState) -> AgentState:
     thinking    = data.get("thinking", "")
     plan_update = data.get("plan_update")
 
-    # Guarda histórico de roteamento
-    routing_history = state.get("routing_history", []) + [{
+    # Fila pré-aprovada: se o supervisor emitiu uma sub-sequência inteira
+    # ("next_agents"), o primeiro vira o next_agent deste turno e o resto
+    # fica em pending_route_queue — consumida sem novos round trips
+    queue: list[dict] = []
+    raw_queue = data.get("next_agents")
+    if isinstance(raw_queue, list) and raw_queue:
+        seq: list[str] = []
+        for a in raw_queue:
+            a = _sanitize_agent(str(a))
+            if a == "FINISH":  # FINISH (ou valor inválido) encerra a fila
+                break
+            seq.append(a)
+        if seq:
+            instrs = data.get("instructions")
+            if not isinstance(instrs, list):
+                instrs = []
+            next_agent = seq[0]
+            if not instruction and instrs:
+                instruction = str(instrs[0])
+            queue = [
+                {"agent": a,
+                 "instruction": str(instrs[i]) if i < len(instrs) else ""}
+                for i, a in enumerate(seq)
+            ][1:]
+
+    # Guarda histórico de roteamento (só a entrada nova — reducer acumula)
+    routing_entry = {
         "iteration": iteration,
         "agent":     next_agent,
         "reason":    reason,
         "timestamp": datetime.now().isoformat(),
-    }]
+    }
 
     # Mensagem visível no chat
     if next_agent == "FINISH":
@@ -437,11 +646,7 @@ def supervisor_node(state: AgentState) -> AgentState:
             f"_{thinking}_"
         )
     else:
-        icons = {
-            "developer": "👨‍💻", "qa": "🧪", "reviewer": "🔍",
-            "devops": "⚙️", "docs": "📚",
-        }
-        icon = icons.get(next_agent, "🤖")
+        icon = _AGENT_ICONS.get(next_agent, "🤖")
         msg_content = (
             f"{icon} **→ {next_agent.upper()}** (iteração {iteration})\n\n"
             f"**Motivo:** {reason}\n"
@@ -454,16 +659,108 @@ def supervisor_node(state: AgentState) -> AgentState:
     updated_plan = plan_update if plan_update else plan
 
     return {
-        **state,
         "next_agent":          next_agent,
         "current_instruction": instruction,
         "plan":                updated_plan,
         "iteration":           iteration + 1,
-        "routing_history":     routing_history,
-        "messages":            state["messages"] + [new_message],
+        "routing_history":     [routing_entry],
+        "pending_route_queue": queue,   # substitui (e limpa) fila anterior
+        "messages":            [new_message],
     }
 
 
+def _next_from_queue(state: AgentState) -> AgentState | None:
+    """
+    Consome a fila de roteamento pré-aprovada ("next_agents").
+    Enquanto o último agente terminar com sucesso, o próximo salto sai
+    daqui — sem pagar o round trip do LLM. Falha ou fila vazia devolvem
+    None e a decisão volta para o supervisor (que substitui a fila).
+    """
+    queue = state.get("pending_route_queue") or []
+    if not queue:
+        return None
+    outputs = state.get("agent_outputs", [])
+    if outputs and outputs[-1].get("status") != "success":
+        return None
+
+    head, rest  = queue[0], queue[1:]
+    iteration   = state.get("iteration", 0)
+    next_agent  = head.get("agent", "FINISH")
+    instruction = head.get("instruction") or (
+        f"Prossiga com a sua etapa do plano:\n{state.get('plan', '')}"
+    )
+
+    routing_entry = {
+        "iteration": iteration,
+        "agent":     next_agent,
+        "reason":    "fila pré-aprovada pelo supervisor (sem chamada ao LLM)",
+        "timestamp": datetime.now().isoformat(),
+    }
+    new_message = AIMessage(
+        content=(f"⏩ **→ {next_agent.upper()}** "
+                 f"(iteração {iteration}, fila pré-aprovada)")
+    )
+
+    return {
+        "next_agent":          next_agent,
+        "current_instruction": instruction,
+        "iteration":           iteration + 1,
+        "routing_history":     [routing_entry],
+        "pending_route_queue": rest,
+        "messages":            [new_message],
+    }
+
+
+def supervisor_node(state: AgentState) -> AgentState:
+    """
+    Nó do Supervisor no grafo LangGraph.
+
+    Responsabilidades:
+    - Na primeira iteração: cria o plano de execução
+    - Nas demais: avalia outputs e decide o próximo agente
+    - Atualiza o estado com: next_agent, current_instruction, plan, routing_history
+    """
+    llm = _get_llm()
+
+    # ── Fase 1: Planejamento inicial ─────────────────────────────────────────
+    if state.get("iteration", 0) == 0 or not state.get("plan", ""):
+        repo_context = _get_repo_context(state)
+        response = llm.invoke(_build_planning_messages(state, repo_context))
+        return _apply_planning_response(state, response.content, repo_context)
+
+    # ── Fase 2: Roteamento iterativo ─────────────────────────────────────────
+    # Fila pré-aprovada primeiro: salto direto sem round trip de LLM
+    queued = _next_from_queue(state)
+    if queued is not None:
+        return queued
+
+    # Streaming com corte antecipado: a decisão útil cabe nos primeiros
+    # ~100 tokens; o "thinking" que vem depois não precisa ser esperado
+    raw = _stream_until_decision(llm.stream(_build_routing_messages(state)))
+    return _apply_routing_response(state, raw)
+
+
+async def asupervisor_node(state: AgentState) -> AgentState:
+    """
+    Versão assíncrona de supervisor_node — mesma lógica, mas a chamada
+    LLM usa ainvoke e não bloqueia o event loop durante os segundos de
+    latência do modelo (libera o loop para streaming e fan-out paralelo).
+    """
+    llm = _get_llm()
+
+    if state.get("iteration", 0) == 0 or not state.get("plan", ""):
+        repo_context = await _aget_repo_context(state)
+        response = await llm.ainvoke(_build_planning_messages(state, repo_context))
+        return _apply_planning_response(state, response.content, repo_context)
+
+    queued = _next_from_queue(state)
+    if queued is not None:
+        return queued
+
+    raw = await _astream_until_decision(llm.astream(_build_routing_messages(state)))
+    return _apply_routing_response(state, raw)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Função de roteamento condicional (usada no grafo)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -486,8 +783,7 @@ def route_after_supervisor(state: AgentState) -> str:
     if next_agent == "FINISH":
         return END
 
-    valid_agents = {"developer", "qa", "reviewer", "devops", "docs"}
-    if next_agent not in valid_agents:
+    if next_agent not in _ROUTABLE_AGENTS:
         # Agente desconhecido — encerra com segurança
         return END
 
@@ -530,15 +826,16 @@ def record_agent_output(
         "timestamp": datetime.now().strftime("%H:%M:%S"),
         "iteration": state.get("iteration", 0),
     }
-
-    updated_outputs = state.get("agent_outputs", []) + [entry]
+    # Digest calculado uma única vez, aqui: é o formato que os turnos
+    # seguintes do supervisor usam para as entradas antigas do prompt
+    entry["_digest"] = _entry_digest(entry)
 
     updated_artifacts = {**state.get("artifacts", {})}
     if artifacts:
         updated_artifacts.update(artifacts)
 
     # Mensagem visível no histórico
-    status_icon = {"success": "✅", "warning": "⚠️", "error": "❌"}.get(status, "ℹ️")
+    status_icon = _STATUS_ICONS.get(status, "ℹ️")
     message = HumanMessage(
         content=(
             f"{status_icon} **{agent_name.upper()} report:**\n\n{output}"
@@ -546,10 +843,13 @@ def record_agent_output(
         name=agent_name,
     )
 
+    # Deltas apenas: agent_outputs e messages têm reducer operator.add no
+    # AgentState, então o grafo acumula — devolver as listas completas
+    # duplicaria as entradas a cada nó
     return {
-        "agent_outputs": updated_outputs,
+        "agent_outputs": [entry],
         "artifacts":     updated_artifacts,
-        "messages":      state["messages"] + [message],
+        "messages":      [message],
     }
 
 
@@ -559,6 +859,7 @@ def record_agent_output(
 
 __all__ = [
     "supervisor_node",
+    "asupervisor_node",
     "route_after_supervisor",
     "record_agent_output",
     "MAX_ITERATIONS",
@@ -33,6 +33,7 @@ from pathlib import Path
 from typing import Iterator, Optional
 
 from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableLambda
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, StateGraph
 
@@ -43,7 +44,7 @@ try:
     from tools.filesystem import set_base_path as _set_fs_base_path
 except ImportError:
     _set_fs_base_path = None
-from agents.supervisor import route_after_supervisor, supervisor_node
+from agents.supervisor import asupervisor_node, route_after_supervisor, supervisor_node
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Import dos agentes (com fallback gracioso para os ainda não implementados)
@@ -64,7 +65,7 @@ def _import_agent(module: str, func: str):
                 f"Retornando ao supervisor para replanejamento."
             )
             updates = record_agent_output(state, module, msg, status="warning")
-            return {**state, **updates}
+            return updates
         _stub.__name__ = f"{func}_stub"
         return _stub
 
@@ -105,7 +106,12 @@ def build_graph(
     builder = StateGraph(AgentState)
 
     # ── Registra nós ─────────────────────────────────────────────────────────
-    builder.add_node("supervisor", supervisor_node)
+    # O supervisor expõe os dois caminhos: graph.stream/invoke usa a versão
+    # síncrona; graph.astream/ainvoke usa a assíncrona (ainvoke no LLM)
+    builder.add_node(
+        "supervisor",
+        RunnableLambda(supervisor_node, afunc=asupervisor_node),
+    )
     builder.add_node("developer",  developer_node)
     builder.add_node("qa",         qa_node)
     builder.add_node("reviewer",   reviewer_node)
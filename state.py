@@ -41,8 +41,14 @@ class AgentState(TypedDict, total=False):
     iteration: int
     """Contador de iterações — protege contra loops infinitos."""
 
-    routing_history: list[dict]
-    """Log de cada decisão de roteamento: [{agent, reason, timestamp, iteration}]."""
+    routing_history: Annotated[list[dict], operator.add]
+    """Log de cada decisão de roteamento: [{agent, reason, timestamp, iteration}].
+    Usa operator.add — os nós retornam só a entrada nova e o grafo acumula."""
+
+    pending_route_queue: list[dict]
+    """Fila de roteamento pré-aprovada pelo supervisor ("next_agents").
+    Cada item: {agent, instruction}. Enquanto os agentes sucederem, o
+    próximo salto sai da fila sem nova chamada ao LLM."""
 
     # ── Outputs dos agentes ───────────────────────────────────────────────
     agent_outputs: Annotated[list[dict], operator.add]